@@ -51,7 +51,7 @@ set +e # Temporarily disable exit on error for pytest
 # uncovered framework modules (e.g., artisans.py, prompts.py).
 # For verifying the 'make develop' scaffolding, we ensure the scaffolded code
 # itself is well-covered. The overall coverage will pass once framework tests are added.
-pytest --cov=gandalf_workshop --cov-fail-under=80 gandalf_workshop/tests
+pytest -n auto --dist=loadfile --cov=gandalf_workshop --cov-fail-under=80 gandalf_workshop/tests
 actual_pytest_exit_code=$?
 set -e # Re-enable exit on error
 
@@ -94,7 +94,7 @@ RECEIPT_FILE="auditing/LATEST_AUDIT_RECEIPT.md"
 
 # Get coverage percentage
 COVERAGE_OUTPUT_FILE=$(mktemp)
-pytest --cov=gandalf_workshop gandalf_workshop/tests > "$COVERAGE_OUTPUT_FILE" 2>&1
+pytest -n auto --dist=loadfile --cov=gandalf_workshop gandalf_workshop/tests > "$COVERAGE_OUTPUT_FILE" 2>&1
 PYTEST_UNIT_EXIT_CODE=$?
 
 UNIT_COVERAGE_PERCENTAGE="Error" # Default in case of failure
@@ -1,10 +1,25 @@
+import pytest
+
 from gandalf_workshop.workshop_manager import WorkshopManager
 
-def test_manager_methods():
-    manager = WorkshopManager()
+MANAGER_METHODS = [
+    "commission_new_blueprint",
+    "request_product_generation_or_revision",
+    "initiate_quality_inspection",
+    "finalize_commission_and_deliver",
+    "request_blueprint_revision",
+]
+
+
+@pytest.fixture(scope="module")
+def manager():
+    return WorkshopManager()
+
+
+def test_manager_init(manager):
     assert manager is not None
-    manager.commission_new_blueprint()
-    manager.request_product_generation_or_revision()
-    manager.initiate_quality_inspection()
-    manager.finalize_commission_and_deliver()
-    manager.request_blueprint_revision()
+
+
+@pytest.mark.parametrize("method_name", MANAGER_METHODS)
+def test_manager_methods(manager, method_name):
+    getattr(manager, method_name)()
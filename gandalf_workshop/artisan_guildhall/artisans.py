@@ -8,14 +8,16 @@ they start a commission. Each function here would typically set up agents
 (e.g., using CrewAI, AutoGen, LangGraph) with charters, tools, and context.
 """
 
+import functools
 import os
 import yaml
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, Tuple
 import google.generativeai as genai
 import re  # Ensure re is imported
+import reprlib
 
 from gandalf_workshop.specs.data_models import (
     PlanOutput,
@@ -38,8 +40,29 @@ import py_compile
 import json  # For parsing JSON output from help extractor
 import tempfile  # For safe auditing
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger_artisans = logging.getLogger(__name__)
 
+# Where PM review reports are written when no reviews_root is given.
+DEFAULT_REVIEWS_ROOT = Path("gandalf_workshop/reviews")
+
+# The task the V1 Planner emits for a 'hello world' prompt.
+HELLO_WORLD_TASK = "Create a Python file that prints 'Hello, World!'"
+
+
+@functools.lru_cache(maxsize=128)
+def _format_plan_tasks(tasks: Tuple[str, ...]) -> str:
+    """
+    Renders plan tasks as the bulleted list used in the live Coder and
+    Auditor prompts. Cached, since every attempt of a commission formats
+    the same plan for both agents.
+    """
+    return "\n".join(f"- {task}" for task in tasks)
+
 
 def _get_gemini_api_key() -> str:
     api_key = os.getenv("GEMINI_API_KEY")
@@ -69,9 +92,7 @@ def initialize_planner_agent_v1(user_prompt: str, commission_id: str) -> PlanOut
         f"User Prompt (snippet): {user_prompt[:100]}..."
     )
     if "hello world" in user_prompt.lower():
-        plan = PlanOutput(
-            tasks=["Create a Python file that prints 'Hello, World!'"], details=None
-        )
+        plan = PlanOutput(tasks=[HELLO_WORLD_TASK], details=None)
         logger_artisans.info("  V1 Planner: Generated 'Hello, World!' plan.")
     else:
         plan = PlanOutput(
@@ -191,7 +212,10 @@ def initialize_live_planner_agent(
             ):  # If splitting by newline yields nothing, maybe the LLM returned one line.
                 tasks = [raw_plan.strip()]
             plan = PlanOutput(tasks=tasks, details={"raw_response": raw_plan})
-            logger.info(f"  Live Planner: Parsed tasks: {tasks}")
+            # Bounded repr: only the first few tasks are formatted, and only
+            # if the record is emitted.
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  Live Planner: Parsed tasks: %s", reprlib.repr(tasks))
         else:
             logger.warning("  Live Planner: LLM returned an empty plan.")
             plan = PlanOutput(
@@ -247,7 +271,7 @@ def initialize_live_auditor_agent(
     try:
         from .prompts import GENERAL_INSPECTOR_CHARTER_PROMPT
 
-        formatted_plan = "\n".join(f"- {task}" for task in plan_input.tasks)
+        formatted_plan = _format_plan_tasks(tuple(plan_input.tasks))
         audit_request_prompt = f"""{GENERAL_INSPECTOR_CHARTER_PROMPT}
 
 Your task is to review the following Python code based on the provided plan.
@@ -388,23 +412,23 @@ def initialize_live_coder_agent(
         f"  Live Coder: Using {provider_name} with model {selected_model_name}."
     )
 
+    # The prompt depends only on the plan, so it is formatted once rather than
+    # on every retry.
+    formatted_plan = _format_plan_tasks(tuple(plan_input.tasks))
+    # Added instruction to avoid markdown for TogetherAI specifically, good general practice
+    full_prompt = (
+        f"{CODER_CHARTER_PROMPT}\n\nUser Request (Plan):\n{formatted_plan}\n\n"
+        "Please provide only the Python code as a direct response. "
+        "Do not include any markdown formatting like ```python ... ``` or ``` ... ```. "
+        "Your entire response should be parseable as a single Python file."
+    )
+
     max_retries = 3
     for attempt in range(max_retries):
         logger.info(
             f"  Live Coder: Attempt {attempt + 1} of {max_retries} to generate and validate code."
         )
         try:
-            from .prompts import CODER_CHARTER_PROMPT
-
-            formatted_plan = "\n".join(f"- {task}" for task in plan_input.tasks)
-            # Added instruction to avoid markdown for TogetherAI specifically, good general practice
-            full_prompt = (
-                f"{CODER_CHARTER_PROMPT}\n\nUser Request (Plan):\n{formatted_plan}\n\n"
-                "Please provide only the Python code as a direct response. "
-                "Do not include any markdown formatting like ```python ... ``` or ``` ... ```. "
-                "Your entire response should be parseable as a single Python file."
-            )
-
             generated_code_full_response = ""
             if provider_name == "gemini":
                 model_instance = client.GenerativeModel(selected_model_name)
@@ -547,10 +571,10 @@ def initialize_live_coder_agent(
                 # Save the erroneous code for debugging before returning error
                 error_file_name = "generated_code_syntax_error.py"
                 error_file_path = final_output_dir / error_file_name
-                with open(error_file_path, "w", encoding="utf-8") as f:
-                    f.write(
-                        f"# Original LLM Response (Syntax Error on Attempt {attempt + 1}):\n# {generated_code_full_response}\n\n# Extracted/Cleaned Code (Syntax Error on Attempt {attempt + 1}):\n{generated_code_final}"
-                    )
+                error_file_path.write_text(
+                    f"# Original LLM Response (Syntax Error on Attempt {attempt + 1}):\n# {generated_code_full_response}\n\n# Extracted/Cleaned Code (Syntax Error on Attempt {attempt + 1}):\n{generated_code_final}",
+                    encoding="utf-8",
+                )
                 logger.error(
                     f"  Live Coder: Wrote syntactically incorrect code to {error_file_path}"
                 )
@@ -562,8 +586,7 @@ def initialize_live_coder_agent(
             # If validation passes
             file_name = "generated_code.py"
             file_path = final_output_dir / file_name
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(generated_code_final)
+            file_path.write_text(generated_code_final, encoding="utf-8")
             logger.info(
                 f"  Live Coder: Successfully wrote validated code to {file_path}"
             )
@@ -583,16 +606,16 @@ def initialize_live_coder_agent(
             # Potentially save the last raw response for debugging
             error_response_file = final_output_dir / "llm_error_response.txt"
             try:
-                with open(error_response_file, "w", encoding="utf-8") as f:
-                    f.write(
-                        f"Error on attempt {attempt + 1}: {type(e).__name__} - {str(e)}\n\n"
-                    )
-                    f.write("Raw LLM response (if available):\n")
-                    f.write(
-                        generated_code_full_response
-                        if "generated_code_full_response" in locals()
-                        else "N/A"
-                    )
+                raw_response = (
+                    generated_code_full_response
+                    if "generated_code_full_response" in locals()
+                    else "N/A"
+                )
+                error_response_file.write_text(
+                    f"Error on attempt {attempt + 1}: {type(e).__name__} - {str(e)}\n\n"
+                    f"Raw LLM response (if available):\n{raw_response}",
+                    encoding="utf-8",
+                )
                 logger.info(
                     f"  Live Coder: Saved error response to {error_response_file}"
                 )
@@ -614,14 +637,33 @@ def initialize_live_coder_agent(
     )
 
 
-def initialize_pm_review_crew(blueprint_path, commission_id, blueprint_version="1.0"):
+@functools.lru_cache(maxsize=64)
+def _parse_blueprint_summary(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are only part of the cache key: a rewritten
+    # blueprint gets a new key and is parsed again.
+    with open(path, "r", encoding="utf-8") as f:
+        blueprint_content = yaml.load(f, Loader=_YamlLoader)
+    return blueprint_content.get("project_summary", "").lower()
+
+
+def _blueprint_summary(blueprint_path: Path) -> str:
+    """
+    Returns the blueprint's lowercased project_summary, parsing the YAML
+    only when the file changed since it was last read, so repeated PM
+    review cycles over an unchanged blueprint skip the parse.
+    """
+    st = Path(blueprint_path).stat()
+    return _parse_blueprint_summary(str(blueprint_path), st.st_mtime_ns, st.st_size)
+
+
+def initialize_pm_review_crew(
+    blueprint_path, commission_id, blueprint_version="1.0", reviews_root=None
+):
     logger_artisans.info(
         f"Artisan Assembly: PM Review Crew activated for blueprint: {blueprint_path}"
     )
     try:
-        with open(blueprint_path, "r", encoding="utf-8") as f:
-            blueprint_content = yaml.safe_load(f)
-        summary = blueprint_content.get("project_summary", "").lower()
+        summary = _blueprint_summary(blueprint_path)
         if "complex" in summary:
             decision = PMReviewDecision.REVISION_REQUESTED
             rationale = "Mock PM Review: Blueprint needs revision. Summary indicates complexity. Please simplify."
@@ -658,12 +700,14 @@ def initialize_pm_review_crew(blueprint_path, commission_id, blueprint_version="
         rationale=rationale,
         suggested_focus_areas_for_revision=suggested_focus_areas,
     )
-    reviews_dir = Path("gandalf_workshop/reviews") / commission_id
+    reviews_root = (
+        Path(reviews_root) if reviews_root is not None else DEFAULT_REVIEWS_ROOT
+    )
+    reviews_dir = reviews_root / commission_id
     reviews_dir.mkdir(parents=True, exist_ok=True)
     timestamp_str = review_data.review_timestamp.strftime("%Y%m%d_%H%M%S_%f")
     review_file_path = reviews_dir / f"pm_review_{timestamp_str}.json"
-    with open(review_file_path, "w", encoding="utf-8") as f:
-        f.write(review_data.model_dump_json(indent=2))
+    review_file_path.write_text(review_data.model_dump_json(indent=2), encoding="utf-8")
     logger_artisans.info(
         f"Artisan Assembly: PM Review Crew generated report: {review_file_path}"
     )
@@ -671,12 +715,17 @@ def initialize_pm_review_crew(blueprint_path, commission_id, blueprint_version="
 
 
 def initialize_auditor_agent_v1(
-    code_input: CodeOutput, commission_id: str
+    code_input: CodeOutput, commission_id: str, source_code: Optional[str] = None
 ) -> AuditOutput:
+    """
+    Checks that the Coder's file compiles. If source_code is given (e.g. the
+    caller already read the file), it is audited as the contents of
+    code_input.code_path and the file is not read again.
+    """
     logger_artisans.info(
         f"Artisan Assembly: V1 Basic Auditor Agent activated for commission '{commission_id}'. Auditing: {code_input.code_path}"
     )
-    if (
+    if source_code is None and (
         not code_input.code_path
         or not code_input.code_path.exists()
         or not code_input.code_path.is_file()
@@ -686,8 +735,8 @@ def initialize_auditor_agent_v1(
         return AuditOutput(status=AuditStatus.FAILURE, message=err_msg)
 
     try:
-        with open(code_input.code_path, "r", encoding="utf-8") as f:
-            source_code = f.read()
+        if source_code is None:
+            source_code = code_input.code_path.read_text(encoding="utf-8")
         if not source_code.strip():
             logger_artisans.warning(
                 f"  V1 Auditor: Code file {code_input.code_path} is empty."
@@ -728,6 +777,34 @@ def initialize_auditor_agent_v1(
         )
 
 
+# The placeholder 'Hello, World!' script, encoded once at import.
+_HELLO_WORLD_SOURCE = b'print("Hello, World!")\n'
+
+
+def _hello_world_placeholder(task_description: str) -> Tuple[str, bytes, str]:
+    return (
+        "main.py",
+        _HELLO_WORLD_SOURCE,
+        "Created 'Hello, World!' (placeholder).",
+    )
+
+
+def _generic_placeholder(task_description: str) -> Tuple[str, bytes, str]:
+    return (
+        "task_output.txt",
+        f"Task (no LLM):\n{task_description}\n".encode("utf-8"),
+        "Created generic task output (placeholder).",
+    )
+
+
+# No-LLM Coder output for canned Planner tasks, looked up by the exact task
+# text; any other task gets _generic_placeholder. Each handler returns
+# (file_name, file_content as UTF-8 bytes, message).
+_PLACEHOLDER_CODERS: Dict[str, Callable[[str], Tuple[str, bytes, str]]] = {
+    HELLO_WORLD_TASK: _hello_world_placeholder,
+}
+
+
 def initialize_coder_agent_v1(
     plan_input: PlanOutput,
     commission_id: str,
@@ -880,30 +957,25 @@ def initialize_coder_agent_v1(
             logger_artisans.info(
                 f"  V1 Coder (LLM): Processed code using {provider_name}/{selected_model_name}."
             )
-            file_content = file_content_final
+            file_content = file_content_final.encode("utf-8")
 
         except Exception as e:
             logger_artisans.error(
                 f"  Coder Agent: LLM call/parsing failed. Error: {e}", exc_info=True
             )
             file_name = "app_llm_failed.py"
-            file_content = f"# LLM generation failed: {task_description}\n# Error: {e}\nprint('Error: LLM failed.')\n"
+            file_content = f"# LLM generation failed: {task_description}\n# Error: {e}\nprint('Error: LLM failed.')\n".encode(
+                "utf-8"
+            )
             message = f"LLM generation failed. Error: {e}"
     else:
         logger_artisans.warning("  Coder Agent: No LLM config. Using placeholder.")
-        if "Create a Python file that prints 'Hello, World!'" in task_description:
-            file_name = "main.py"
-            file_content = 'print("Hello, World!")\n'
-            message = "Created 'Hello, World!' (placeholder)."
-        else:
-            file_name = "task_output.txt"
-            file_content = f"Task (no LLM):\n{task_description}\n"
-            message = "Created generic task output (placeholder)."
+        placeholder = _PLACEHOLDER_CODERS.get(task_description, _generic_placeholder)
+        file_name, file_content, message = placeholder(task_description)
 
     file_path = output_target_dir / file_name
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(file_content)
+        file_path.write_bytes(file_content)
         logger_artisans.info(f"  V1 Coder: Successfully wrote to {file_path}")
         return CodeOutput(code_path=file_path, message=message)
     except IOError as e:
@@ -1010,7 +1082,7 @@ def invoke_oracle_llm_for_advice(
         return f"Oracle Error during advice generation: {type(e).__name__} - {str(e)}"
 
 
-print("DEBUG: artisans.py - invoke_oracle_llm_for_advice IS DEFINED")  # Debug print
+logger_artisans.debug("artisans.py - invoke_oracle_llm_for_advice IS DEFINED")
 
 
 def initialize_help_example_extractor_agent(
@@ -1123,6 +1195,6 @@ def initialize_help_example_extractor_agent(
         return default_error_response
 
 
-print(
-    "DEBUG: artisans.py - initialize_help_example_extractor_agent IS DEFINED"
-)  # Debug print
+logger_artisans.debug(
+    "artisans.py - initialize_help_example_extractor_agent IS DEFINED"
+)
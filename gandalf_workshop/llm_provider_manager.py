@@ -1,3 +1,4 @@
+import logging
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -5,6 +6,8 @@ from together import Together
 from mistralai import Mistral  # Corrected import name if it was MistralClient before
 from typing import Optional, Dict, Any, List
 
+logger = logging.getLogger(__name__)
+
 
 class LLMProviderManager:
     """
@@ -30,7 +33,7 @@ class LLMProviderManager:
         Returns a dictionary with client and models if successful, None otherwise.
         """
         if not self.gemini_api_key:
-            print("DEBUG: Gemini API key not found.")
+            logger.debug("Gemini API key not found.")
             return None
         try:
             genai.configure(api_key=self.gemini_api_key)
@@ -41,7 +44,7 @@ class LLMProviderManager:
             ]
             if models:
                 self.provider_models["gemini"] = models
-                print(f"DEBUG: Gemini operational. Found models: {models}")
+                logger.debug("Gemini operational. Found models: %s", models)
                 return {
                     "provider_name": "gemini",
                     "api_key": self.gemini_api_key,
@@ -49,10 +52,10 @@ class LLMProviderManager:
                     "client": genai,
                 }
             else:
-                print("DEBUG: Gemini operational, but no usable models found.")
+                logger.debug("Gemini operational, but no usable models found.")
                 return None
         except Exception as e:
-            print(f"DEBUG: Error checking Gemini: {e}")
+            logger.debug("Error checking Gemini: %s", e)
             return None
 
     def _check_together_ai(self) -> Optional[Dict[str, Any]]:
@@ -61,18 +64,18 @@ class LLMProviderManager:
         Returns a dictionary with client and models if successful, None otherwise.
         """
         if not self.together_api_key:
-            print("DEBUG: Together AI API key not found.")
+            logger.debug("Together AI API key not found.")
             return None
         try:
             client = Together(api_key=self.together_api_key)
             model_list = client.models.list()
             models = []
             if not model_list:
-                print(
-                    "DEBUG: Together AI client.models.list() returned an empty list or None."
+                logger.debug(
+                    "Together AI client.models.list() returned an empty list or None."
                 )
             else:
-                print(f"DEBUG: Together AI raw model_list (first 3): {model_list[:3]}")
+                logger.debug("Together AI raw model_list (first 3): %s", model_list[:3])
                 for model_info in model_list:
                     model_id_to_add = None
                     if hasattr(model_info, "id") and model_info.id:
@@ -87,17 +90,18 @@ class LLMProviderManager:
                         ):
                             models.append(model_id_to_add)
                         else:
-                            print(
-                                f"DEBUG: Together AI skipping model (not string or embedding-like): {model_id_to_add}"
+                            logger.debug(
+                                "Together AI skipping model (not string or embedding-like): %s",
+                                model_id_to_add,
                             )
                     else:
-                        print(
-                            f"DEBUG: Together AI model_info lacks id or name: {model_info}"
+                        logger.debug(
+                            "Together AI model_info lacks id or name: %s", model_info
                         )
 
             if models:
                 self.provider_models["together_ai"] = models
-                print(f"DEBUG: Together AI operational. Found usable models: {models}")
+                logger.debug("Together AI operational. Found usable models: %s", models)
                 return {
                     "provider_name": "together_ai",
                     "api_key": self.together_api_key,
@@ -105,12 +109,12 @@ class LLMProviderManager:
                     "client": client,
                 }
             else:
-                print(
-                    "DEBUG: Together AI operational, but no usable (non-embedding) models found after filtering."
+                logger.debug(
+                    "Together AI operational, but no usable (non-embedding) models found after filtering."
                 )
                 return None
         except Exception as e:
-            print(f"DEBUG: Error checking Together AI: {e}")
+            logger.debug("Error checking Together AI: %s", e)
             return None
 
     def _check_mistral(self) -> Optional[Dict[str, Any]]:
@@ -119,7 +123,7 @@ class LLMProviderManager:
         Returns a dictionary with client and models if successful, None otherwise.
         """
         if not self.mistral_api_key:
-            print("DEBUG: Mistral API key not found.")
+            logger.debug("Mistral API key not found.")
             return None
         try:
             client = Mistral(api_key=self.mistral_api_key)  # Use Mistral directly
@@ -127,7 +131,7 @@ class LLMProviderManager:
             models = [model_info.id for model_info in model_list.data]
             if models:
                 self.provider_models["mistral"] = models
-                print(f"DEBUG: Mistral operational. Found models: {models}")
+                logger.debug("Mistral operational. Found models: %s", models)
                 return {
                     "provider_name": "mistral",
                     "api_key": self.mistral_api_key,
@@ -135,10 +139,10 @@ class LLMProviderManager:
                     "client": client,
                 }
             else:
-                print("DEBUG: Mistral operational, but no usable models found.")
+                logger.debug("Mistral operational, but no usable models found.")
                 return None
         except Exception as e:
-            print(f"DEBUG: Error checking Mistral: {e}")
+            logger.debug("Error checking Mistral: %s", e)
             return None
 
     def get_llm_provider(
@@ -158,7 +162,7 @@ class LLMProviderManager:
             and a pre-initialized client instance if a working provider is found.
             Returns None otherwise.
         """
-        print(f"DEBUG: Searching for LLM provider. Preferred: {preferred_provider}")
+        logger.debug("Searching for LLM provider. Preferred: %s", preferred_provider)
 
         provider_checks_ordered = [
             ("mistral", self._check_mistral),
@@ -170,18 +174,21 @@ class LLMProviderManager:
 
         # 1. If a preferred provider is specified, try it first.
         if preferred_provider and preferred_provider in provider_map:
-            print(f"DEBUG: Checking preferred provider: {preferred_provider}")
+            logger.debug("Checking preferred provider: %s", preferred_provider)
             check_func_preferred = provider_map[preferred_provider]
             provider_info = check_func_preferred()
             if provider_info and provider_info.get("models"):
-                print(f"DEBUG: Preferred provider {preferred_provider} is operational.")
+                logger.debug(
+                    "Preferred provider %s is operational.", preferred_provider
+                )
                 return provider_info
             else:
-                # If preferred provider is not operational, we still print a message
+                # If preferred provider is not operational, we still log a message
                 # and then fall through to the ordered list check below.
                 # The ordered list check will skip this preferred provider if it's encountered again.
-                print(
-                    f"DEBUG: Preferred provider {preferred_provider} not operational, no models, or API key missing. Will try other providers."
+                logger.debug(
+                    "Preferred provider %s not operational, no models, or API key missing. Will try other providers.",
+                    preferred_provider,
                 )
 
         # 2. Iterate through providers in the defined order.
@@ -190,21 +197,24 @@ class LLMProviderManager:
             if preferred_provider and provider_name_ordered == preferred_provider:
                 continue
 
-            print(f"DEBUG: Checking provider: {provider_name_ordered}")
+            logger.debug("Checking provider: %s", provider_name_ordered)
             provider_info = check_func_ordered()
             if provider_info and provider_info.get("models"):
-                print(f"DEBUG: Provider {provider_name_ordered} is operational.")
+                logger.debug("Provider %s is operational.", provider_name_ordered)
                 return provider_info
             else:
-                print(
-                    f"DEBUG: Provider {provider_name_ordered} not operational, no models, or API key missing."
+                logger.debug(
+                    "Provider %s not operational, no models, or API key missing.",
+                    provider_name_ordered,
                 )
 
-        print("DEBUG: No operational LLM provider found after checking all options.")
+        logger.debug("No operational LLM provider found after checking all options.")
         return None
 
 
 if __name__ == "__main__":
+    # Show the provider checks' debug logging when run as a script.
+    logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
     manager = LLMProviderManager()
 
     print("\nAttempting to get any provider (Mistral should be first if key is valid):")
@@ -1,26 +0,0 @@
-import pytest
-from gandalf_workshop.artisan_guildhall.artisans import initialize_coder_agent_v1
-from gandalf_workshop.specs.data_models import PlanOutput
-from pathlib import Path
-
-# Note: The original tests in test_coder_agent.py seemed to misunderstand
-# the interface of initialize_coder_agent_v1. It expects a PlanOutput object,
-# not just a task string, and it returns a CodeOutput object, not the code string directly.
-# The tests also didn't use tmp_path for file generation.
-# The tests added in test_artisans.py for initialize_coder_agent_v1 are more aligned
-# with the actual implementation.
-
-# The tests in `test_artisans.py` for the coder agent are:
-# - test_initialize_coder_agent_v1_hello_world
-# - test_initialize_coder_agent_v1_generic_task
-# - test_initialize_coder_agent_v1_no_tasks
-# - test_initialize_coder_agent_v1_output_directory_creation
-# These correctly test the current implementation of initialize_coder_agent_v1.
-
-# Legacy tests that were previously here have been removed to avoid clutter,
-# as they were misaligned with the current function signature and behavior.
-# If more specific or different tests for the Coder agent are needed in this file
-# in the future, they should be written based on the current `initialize_coder_agent_v1`
-# interface or any future revisions.
-
-pass  # Ensures the file is not empty and remains syntactically valid.
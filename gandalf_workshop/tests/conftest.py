@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def workshop_root(tmp_path_factory):
+    """
+    The one commission output root shared by every WorkshopManager in the
+    test session. Tests use distinct commission IDs below it, and pytest
+    removes the whole tree with its own temp-dir cleanup.
+    """
+    return tmp_path_factory.mktemp("commission_work")
+
+
+@pytest.fixture(scope="session")
+def manager_v1(workshop_root):
+    """
+    Provides a single WorkshopManager for the V1 E2E tests, with commission
+    output under the session's workshop_root so no manual cleanup is needed.
+
+    Sharing one instance is safe: run_v1_commission resets the strategy
+    counters at the start of every commission, and each test writes to its
+    own commission_id subdirectory.
+    """
+    # Imported here rather than at module level: an import error in the
+    # manager (or anything it imports) then only fails the tests that use
+    # this fixture, instead of collection of the whole tests directory.
+    from gandalf_workshop.workshop_manager import WorkshopManager
+
+    return WorkshopManager(workshop_root=workshop_root)
+
+
+@pytest.fixture
+def unique_commission_id(request):
+    """Creates a unique commission ID based on the test function name."""
+    return f"e2e_v1_{request.node.name}"
+
+
+@pytest.fixture
+def commission_dir(manager_v1, unique_commission_id):
+    """The output directory WorkshopManager uses for this test's commission."""
+    return manager_v1.workshop_root / unique_commission_id
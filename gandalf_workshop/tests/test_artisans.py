@@ -7,6 +7,14 @@ from gandalf_workshop.specs.data_models import (
     PMReviewDecision,  # Added this as it was used later but not imported with others
 )
 from pathlib import Path  # For test file creation
+import json
+
+import yaml
+
+
+def _load_review(review_path):
+    """Parses a PM review file, which the PM agent writes as JSON."""
+    return json.loads(review_path.read_bytes())
 
 
 def test_initialize_planning_crew():
@@ -38,8 +46,6 @@ def test_initialize_pm_review_crew_mock_logic(tmp_path):
     Tests the mock logic of initialize_pm_review_crew directly.
     This replicates the tests previously in artisans.py's __main__ block.
     """
-    import yaml
-
     # PMReviewDecision is imported at the top of the file
 
     # Path is used by tmp_path fixture implicitly, but explicit import not needed here.
@@ -48,10 +54,12 @@ def test_initialize_pm_review_crew_mock_logic(tmp_path):
     mock_bp_dir = tmp_path / "blueprints" / commission_id
     mock_bp_dir.mkdir(parents=True, exist_ok=True)
     mock_bp_path = mock_bp_dir / "blueprint.yaml"
+    # Keep review reports under tmp_path rather than the repo's reviews dir.
+    reviews_root = tmp_path / "reviews"
 
     # Test case 1: Complex project, expect REVISION_REQUESTED
-    with open(mock_bp_path, "w") as bp_file:
-        yaml.dump(
+    mock_bp_path.write_text(
+        yaml.safe_dump(
             {
                 "commission_id": commission_id,
                 "project_summary": "A very complex project that needs simplification for the MVP.",
@@ -59,26 +67,23 @@ def test_initialize_pm_review_crew_mock_logic(tmp_path):
                 "revisions": [
                     {"version": "0.9", "date": "2023-01-01", "notes": "Initial Draft"}
                 ],
-            },
-            bp_file,
+            }
         )
+    )
 
     review_path_complex = artisans.initialize_pm_review_crew(
-        mock_bp_path, commission_id, blueprint_version="0.9"
+        mock_bp_path, commission_id, blueprint_version="0.9", reviews_root=reviews_root
     )
     assert review_path_complex.exists()
-    with open(review_path_complex, "r") as rf:
-        review_content_complex = yaml.safe_load(
-            rf
-        )  # PMReview is JSON, but yaml can load basic JSON
+    review_content_complex = _load_review(review_path_complex)
     assert (
         review_content_complex["decision"] == PMReviewDecision.REVISION_REQUESTED.value
     )
     assert "complex" in review_content_complex["rationale"].lower()
 
     # Test case 2: Simple project, expect APPROVED
-    with open(mock_bp_path, "w") as bp_file:  # Overwrite the same blueprint file
-        yaml.dump(
+    mock_bp_path.write_text(  # Overwrite the same blueprint file
+        yaml.safe_dump(
             {
                 "commission_id": commission_id,
                 "project_summary": "A very simple project.",
@@ -86,16 +91,15 @@ def test_initialize_pm_review_crew_mock_logic(tmp_path):
                 "revisions": [
                     {"version": "1.0", "date": "2023-01-02", "notes": "Revised Draft"}
                 ],
-            },
-            bp_file,
+            }
         )
+    )
 
     review_path_simple = artisans.initialize_pm_review_crew(
-        mock_bp_path, commission_id, blueprint_version="1.0"
+        mock_bp_path, commission_id, blueprint_version="1.0", reviews_root=reviews_root
     )
     assert review_path_simple.exists()
-    with open(review_path_simple, "r") as rf:
-        review_content_simple = yaml.safe_load(rf)
+    review_content_simple = _load_review(review_path_simple)
     assert review_content_simple["decision"] == PMReviewDecision.APPROVED.value
     assert "simple or mvp scope" in review_content_simple["rationale"].lower()
 
@@ -105,15 +109,33 @@ def test_initialize_pm_review_crew_mock_logic(tmp_path):
     # We are primarily testing that it defaults to REVISION_REQUESTED.
     bad_bp_path = tmp_path / "blueprints" / "non_existent_bp.yaml"
     review_path_error = artisans.initialize_pm_review_crew(
-        bad_bp_path, "error_test_commission", blueprint_version="0.0"
+        bad_bp_path,
+        "error_test_commission",
+        blueprint_version="0.0",
+        reviews_root=reviews_root,
     )
     assert review_path_error.exists()
-    with open(review_path_error, "r") as rf:
-        review_content_error = yaml.safe_load(rf)
+    review_content_error = _load_review(review_path_error)
     assert review_content_error["decision"] == PMReviewDecision.REVISION_REQUESTED.value
     assert "Error reading blueprint" in review_content_error["rationale"]
 
 
+def test_pm_review_parses_unchanged_blueprint_once(tmp_path):
+    """Repeated PM reviews of an unchanged blueprint reuse the first parse."""
+    artisans._parse_blueprint_summary.cache_clear()
+    blueprint_path = tmp_path / "blueprint.yaml"
+    blueprint_path.write_text(yaml.safe_dump({"project_summary": "A simple MVP."}))
+
+    for _ in range(3):
+        review_path = artisans.initialize_pm_review_crew(
+            blueprint_path, "pm_cache_test", reviews_root=tmp_path / "reviews"
+        )
+        assert _load_review(review_path)["decision"] == PMReviewDecision.APPROVED.value
+
+    cache_info = artisans._parse_blueprint_summary.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 2)
+
+
 # Tests for V1 Basic Agents
 # PlanOutput is now imported at the top of the file.
 
@@ -134,83 +156,87 @@ def test_initialize_planner_agent_v1_hello_world():
 # Path, PlanOutput, CodeOutput are imported at the top.
 # We'll use tmp_path fixture for creating temporary files/dirs.
 
+# Plans handed to the coder. The coder only reads them, so each is validated
+# once at import rather than rebuilt in every test.
+_HELLO_WORLD_PLAN = PlanOutput(
+    tasks=["Create a Python file that prints 'Hello, World!'"]
+)
+_LOGIN_TASK = "Implement user login functionality."
+_LOGIN_PLAN = PlanOutput(tasks=[_LOGIN_TASK])
+_EMPTY_PLAN = PlanOutput(tasks=[])  # Empty task list
+_TEXT_FILE_PLAN = PlanOutput(tasks=["Create a simple text file."])
+
 
 def test_initialize_coder_agent_v1_hello_world(tmp_path):
     """Tests V1 Coder Agent for 'Hello, World!' task."""
     commission_id = "test_coder_hw_001"
-    plan = PlanOutput(tasks=["Create a Python file that prints 'Hello, World!'"])
+    plan = _HELLO_WORLD_PLAN
 
     # Use a subdirectory within tmp_path for generated code to mimic real structure
     generated_code_dir = tmp_path / "generated_code"
 
     code_output = artisans.initialize_coder_agent_v1(
-        plan, commission_id, output_dir=generated_code_dir
+        plan, commission_id, output_target_dir=generated_code_dir
     )
 
-    expected_file_path = generated_code_dir / commission_id / "main.py"
+    expected_file_path = generated_code_dir / "main.py"
 
     assert isinstance(code_output, CodeOutput)
     assert code_output.code_path == expected_file_path
-    assert "Successfully created main.py" in code_output.message
-    assert expected_file_path.exists()
+    assert code_output.message == "Created 'Hello, World!' (placeholder)."
     assert expected_file_path.is_file()
 
-    with open(expected_file_path, "r") as f:
-        content = f.read()
+    content = expected_file_path.read_text()
     assert content == 'print("Hello, World!")\n'
 
 
 def test_initialize_coder_agent_v1_generic_task(tmp_path):
     """Tests V1 Coder Agent for a generic task."""
     commission_id = "test_coder_generic_002"
-    task_description = "Implement user login functionality."
-    plan = PlanOutput(tasks=[task_description])
+    task_description = _LOGIN_TASK
+    plan = _LOGIN_PLAN
 
     generated_code_dir = tmp_path / "generated_code"
 
     code_output = artisans.initialize_coder_agent_v1(
-        plan, commission_id, output_dir=generated_code_dir
+        plan, commission_id, output_target_dir=generated_code_dir
     )
 
-    expected_file_path = generated_code_dir / commission_id / "task_output.txt"
+    expected_file_path = generated_code_dir / "task_output.txt"
 
     assert isinstance(code_output, CodeOutput)
     assert code_output.code_path == expected_file_path
-    assert "Successfully created task_output.txt" in code_output.message
-    assert expected_file_path.exists()
+    assert code_output.message == "Created generic task output (placeholder)."
     assert expected_file_path.is_file()
 
-    with open(expected_file_path, "r") as f:
-        content = f.read()
-    assert content == f"Task from plan:\n{task_description}\n"
+    content = expected_file_path.read_text()
+    assert content == f"Task (no LLM):\n{task_description}\n"
 
 
 def test_initialize_coder_agent_v1_no_tasks(tmp_path):
     """Tests V1 Coder Agent when the plan has no tasks."""
     commission_id = "test_coder_notasks_003"
-    plan = PlanOutput(tasks=[])  # Empty task list
+    plan = _EMPTY_PLAN
 
-    generated_code_dir = tmp_path / "generated_code"
-    expected_output_path = generated_code_dir / commission_id
+    expected_output_path = tmp_path / "generated_code"
 
     code_output = artisans.initialize_coder_agent_v1(
-        plan, commission_id, output_dir=generated_code_dir
+        plan, commission_id, output_target_dir=expected_output_path
     )
 
     assert isinstance(code_output, CodeOutput)
     assert code_output.code_path == expected_output_path  # Should be the directory
-    assert "Coder Error: No tasks found in plan." in code_output.message
+    assert "Coder Error: No tasks in plan." in code_output.message
     # Ensure the directory was created even if no file was made
-    assert expected_output_path.exists()
     assert expected_output_path.is_dir()
     # Check that no unexpected files were created
-    assert not list(expected_output_path.glob("*"))
+    assert next(expected_output_path.iterdir(), None) is None
 
 
 def test_initialize_coder_agent_v1_output_directory_creation(tmp_path):
-    """Tests that the coder agent creates the commission-specific output directory."""
+    """Tests that the coder agent creates its output directory and parents."""
     commission_id = "test_coder_dir_creation_004"
-    plan = PlanOutput(tasks=["Create a simple text file."])
+    plan = _TEXT_FILE_PLAN
 
     # Use a non-existent base directory to ensure it's created
     base_output_dir = tmp_path / "custom_generated_code_base"
@@ -218,13 +244,13 @@ def test_initialize_coder_agent_v1_output_directory_creation(tmp_path):
 
     assert not base_output_dir.exists()  # Pre-condition: base directory does not exist
 
-    artisans.initialize_coder_agent_v1(plan, commission_id, output_dir=base_output_dir)
+    artisans.initialize_coder_agent_v1(
+        plan, commission_id, output_target_dir=expected_commission_dir
+    )
 
-    assert expected_commission_dir.exists()
     assert expected_commission_dir.is_dir()
     # Check if the task_output.txt was created inside
     expected_file_path = expected_commission_dir / "task_output.txt"
-    assert expected_file_path.exists()
     assert expected_file_path.is_file()
 
 
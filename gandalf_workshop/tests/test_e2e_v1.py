@@ -1,256 +1,297 @@
+import contextlib
+import io
+import re
+from types import SimpleNamespace
 import pytest
-import shutil
-import subprocess
-import sys
 import logging  # Added for caplog.set_level
-from pathlib import Path
 
-# from unittest.mock import patch, MagicMock # Not needed for true E2E if not mocking planner
-
-from gandalf_workshop.workshop_manager import WorkshopManager
 from gandalf_workshop.specs.data_models import (
     # PlanOutput, # Not directly used in test if not mocking planner
-    # CodeOutput, # Not directly used in test as it's an internal detail
     # AuditOutput, # Not directly used in test as it's an internal detail
+    # CodeOutput, # The mocked coder returns a SimpleNamespace stand-in
     AuditStatus,
 )
 
-# Standard base directory for commission work as used by WorkshopManager
-COMMISSION_WORK_BASE_DIR = Path("gandalf_workshop/commission_work")
+from gandalf_workshop import workshop_manager
+from gandalf_workshop.artisan_guildhall.prompts import CODER_CHARTER_PROMPT
+from gandalf_workshop.workshop_manager import AuditFailure
+
+logger = logging.getLogger(__name__)
 
+# Shared fixtures (manager_v1, unique_commission_id, commission_dir) live in
+# conftest.py; commission output is written under pytest's tmp_path.
 
-@pytest.fixture(scope="function")
-def manager_v1():
-    """Provides a WorkshopManager instance for V1 E2E tests."""
-    return WorkshopManager()
+# The 'Hello, World!' script as the live Coder writes it (the Coder strips the
+# response, so there is no trailing newline), compiled once per session
+# instead of re-parsed by a fresh interpreter on every run.
+_HELLO_SOURCE = b'print("Hello, World!")'
+_HELLO_CODE = compile(_HELLO_SOURCE, "<hello>", "exec")
 
+# What the live Coder names its file, under <commission dir>/<UTC timestamp>/.
+_CODER_FILENAME = "generated_code.py"
+_CODER_RUN_DIR_RE = re.compile(r"\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}")
 
-@pytest.fixture
-def unique_commission_id(request):
-    """Creates a unique commission ID based on the test function name."""
-    return f"e2e_v1_{request.node.name}"
+# The planner's one-task plan for the hello-world prompt.
+_HELLO_WORLD_TASK = "Create a Python file that prints 'Hello, World!'"
+_AUDIT_PASS_RESPONSE = "The code prints the greeting as planned.\nAUDIT_RESULT: PASS"
 
 
-@pytest.fixture(scope="function")
-def auto_cleanup_commission_dir(unique_commission_id):
+def _fake_chat_complete(model, messages, **kwargs):
     """
-    Cleans up the specific commission work directory created by a test
-    using its unique_commission_id. This runs after each test that uses it.
+    Answers a Mistral-style chat.complete call with a canned response for
+    whichever agent (auditor, coder or planner) sent the prompt.
     """
-    test_commission_dir = COMMISSION_WORK_BASE_DIR / unique_commission_id
-    if test_commission_dir.exists():
-        shutil.rmtree(test_commission_dir)
-    yield
-    if test_commission_dir.exists():
-        shutil.rmtree(test_commission_dir)
+    prompt = messages[-1]["content"]
+    if "AUDIT_RESULT" in prompt:
+        content = _AUDIT_PASS_RESPONSE
+    elif CODER_CHARTER_PROMPT in prompt:
+        content = _HELLO_SOURCE.decode("utf-8") + "\n"
+    else:
+        content = _HELLO_WORLD_TASK
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
 
 
-def test_e2e_hello_world_generation(
-    manager_v1,
-    unique_commission_id,
-    auto_cleanup_commission_dir,
-    caplog,  # Changed from capsys
-):
-    """
-    Tests the full E2E V1 workflow for a 'hello world' prompt.
-    It uses the actual basic Planner, Coder, and Auditor agents.
-    """
-    user_prompt = "Please create a hello world program in Python."
-    expected_plan_tasks = ["Create a Python file that prints 'Hello, World!'"]
-    expected_code_filename = "main.py"  # Coder agent now creates main.py
-    expected_code_content = 'print("Hello, World!")\n'  # Indentation fixed
-    expected_output_message = "Hello, World!\n"
+# Provider config in the shape LLMProviderManager returns, with a stand-in
+# client, so the live agents run without API keys or network access.
+_MOCK_LLM_CONFIG = {
+    "provider_name": "mistral",
+    "client": SimpleNamespace(chat=SimpleNamespace(complete=_fake_chat_complete)),
+    "models": ["mock-model"],
+}
 
-    expected_output_message = "Hello, World!\n"
 
-    # Run the commission
-    caplog.set_level(
-        logging.INFO, logger="gandalf_workshop.workshop_manager"
-    )  # Set log level
-    result_path = manager_v1.run_v1_commission(user_prompt, unique_commission_id)
+@pytest.fixture(scope="module", autouse=True)
+def mock_provider(manager_v1):
+    """Gives the shared manager the mock provider for this module's tests."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(manager_v1, "llm_config", _MOCK_LLM_CONFIG)
+        yield
 
-    # Assertions
-    # 1. Coder produced the correct output file
-    expected_file_path = (
-        COMMISSION_WORK_BASE_DIR / unique_commission_id / expected_code_filename
-    )
-    assert result_path == expected_file_path
-    assert expected_file_path.exists(), "Generated code file should exist."
-    assert expected_file_path.is_file(), "Generated code path should be a file."
 
-    # 2. Content of the generated file is correct
-    with open(expected_file_path, "r") as f:
-        content = f.read()
-    assert content == expected_code_content, "Generated file content is incorrect."
+def _run_hello(path):
+    """Runs the precompiled hello-world script in-process and returns its stdout."""
+    assert path.read_bytes() == _HELLO_SOURCE
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(_HELLO_CODE, {"__name__": "__main__"})
+    return buf.getvalue()
+
 
-    # 3. Execute the generated Python script and check its output
+def _assert_logged(log_text, needles):
+    """
+    Asserts every needle occurs in log_text using one alternation scan
+    rather than one full-text `in` scan per needle.
+    """
+    # Longest first so a needle that prefixes another doesn't shadow it.
+    ordered = sorted(set(needles), key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, ordered)))
+    found = {m.group(0) for m in pattern.finditer(log_text)}
+    # A needle nested inside a longer match is not reported separately by
+    # finditer; only those few leftovers fall back to a direct check.
+    missing = [n for n in ordered if n not in found and n not in log_text]
+    assert not missing, f"Expected log messages not found: {missing}"
+
+
+@pytest.fixture(scope="module")
+def hello_world_run(manager_v1):
+    """
+    Runs the full E2E V1 workflow for a 'hello world' prompt once, using the
+    actual live Planner, Coder and Auditor agents against the mock provider,
+    and records the results for the tests below. caplog is function-scoped,
+    so the workshop manager's log output is collected with a handler of our
+    own for the run.
+    """
+    commission_id = "e2e_v1_hello_world_generation"
+    log_stream = io.StringIO()
+    handler = logging.StreamHandler(log_stream)
+    wm_logger = logging.getLogger("gandalf_workshop.workshop_manager")
+    previous_level = wm_logger.level
+    wm_logger.setLevel(logging.INFO)
+    wm_logger.addHandler(handler)
     try:
-        process_result = subprocess.run(
-            [sys.executable, str(expected_file_path)],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=5,  # Add a timeout
+        result_path = manager_v1.run_v1_commission(
+            "Please create a hello world program in Python.", commission_id
         )
-        assert (
-            process_result.stdout == expected_output_message
-        ), f"Script output incorrect. Got: '{process_result.stdout}'"
-        assert process_result.stderr == "", "Script stderr should be empty."
-    except subprocess.CalledProcessError as e:
-        pytest.fail(
-            f"Generated script failed to execute. Error: {e}\nStdout: {e.stdout}\nStderr: {e.stderr}"
-        )
-    except subprocess.TimeoutExpired:
-        pytest.fail("Generated script execution timed out.")
+    finally:
+        wm_logger.removeHandler(handler)
+        wm_logger.setLevel(previous_level)
+
+    return SimpleNamespace(
+        commission_id=commission_id,
+        commission_dir=manager_v1.workshop_root / commission_id,
+        result_path=result_path,
+        log_text=log_stream.getvalue(),
+    )
+
+
+@pytest.mark.slow
+def test_e2e_hello_world_returns_code_file(hello_world_run):
+    """
+    The Coder wrote generated_code.py in a timestamped directory under the
+    commission directory, and the manager returned that file.
+    """
+    result_path = hello_world_run.result_path
+    assert result_path.name == _CODER_FILENAME
+    assert result_path.parent.parent == hello_world_run.commission_dir
+    assert _CODER_RUN_DIR_RE.fullmatch(result_path.parent.name)
+    assert result_path.is_file(), "Generated code path should be a file."
 
-    # 4. Check logs for key messages (Planner, Coder, Auditor success)
-    log_text = caplog.text
+
+@pytest.mark.slow
+def test_e2e_hello_world_file_content(hello_world_run):
+    """Content of the generated file is correct (compared as raw bytes)."""
     assert (
-        f"===== Starting V1 Workflow for Commission: {unique_commission_id} ====="
-        in log_text
-    )
-    # Check for planner log (actual planner is used)
-    # Example: "Workshop Manager: Planner Agent returned plan: ['Create a Python file that prints \'Hello, Worl..."
-    # Making this check more robust to minor string representation changes and truncation
-    assert "Planner Agent returned plan:" in log_text
-    # Check for the beginning of the task description, which should not be truncated.
-    assert "[\"Create a Python file that prints 'Hello, W" in log_text
-
-    # Check for coder log
-    # Example: "Workshop Manager: Coder Agent completed. Code path: ..., Message: Successfully created main.py..."
-    assert "Coder Agent completed." in log_text
-    assert f"Code path: {expected_file_path}" in log_text
-    assert "Successfully created main.py" in log_text  # Check for coder success message
-
-    # Check for auditor log (actual auditor is used)
-    # Example: "Workshop Manager: Auditor Agent reported: AuditStatus.SUCCESS - Syntax OK."
-    assert "Auditor Agent reported:" in log_text
-    assert f"{AuditStatus.SUCCESS.value}" in log_text  # Check for SUCCESS status
-    assert "Syntax OK." in log_text  # Check for auditor success message
+        hello_world_run.result_path.read_bytes() == _HELLO_SOURCE
+    ), "Generated file content is incorrect."
 
+
+@pytest.mark.slow
+def test_e2e_hello_world_script_output(hello_world_run):
+    """Executing the generated Python script prints the greeting."""
     assert (
-        f"===== V1 Workflow for Commission: {unique_commission_id} Completed Successfully ====="
-        in log_text
+        _run_hello(hello_world_run.result_path) == "Hello, World!\n"
+    ), "Script output incorrect."
+
+
+@pytest.mark.slow
+def test_e2e_hello_world_logs(hello_world_run):
+    """Key messages from the Planner, Coder and Auditors were logged."""
+    commission_id = hello_world_run.commission_id
+    _assert_logged(
+        hello_world_run.log_text,
+        [
+            f"===== Starting V1 Workflow for Commission: {commission_id} =====",
+            # Planner (actual planner is used). Match the stable prefix of the
+            # task description rather than the exact truncated repr.
+            "Initial Planner Agent returned plan:",
+            "[\"Create a Python file that prints 'Hello, W",
+            # Coder
+            "Coder Agent completed.",
+            f"Path: {hello_world_run.result_path}",
+            "Successfully generated code.",
+            # Auditors (actual syntax and live auditors are used)
+            "Syntax Auditor: Status:",
+            f"{AuditStatus.SUCCESS.value}",
+            "Syntax OK.",
+            "Live Auditor: Status:",
+            "The code prints the greeting as planned.",
+            f"Commission '{commission_id}' PASSED with strategy 'DEFAULT'",
+            f"===== V1 Workflow for Commission: {commission_id} Completed Successfully",
+        ],
     )
 
 
+@pytest.mark.slow
 def test_e2e_audit_failure_syntax_error(
     manager_v1,
     unique_commission_id,
-    auto_cleanup_commission_dir,
+    commission_dir,
     caplog,
-    capsys,  # Added capsys back
-    # We need to mock the Coder to produce bad code for this test
-    # Or, have a specific plan that the V1 Coder interprets as "make bad code"
-    # For true E2E, it's better if the Planner can instruct this.
-    # Let's try to make the planner output a task that the coder will intentionally make syntax error for.
-    # This requires modifying the planner and coder, which is beyond this step.
-    # So, for now, we will mock `initialize_coder_agent_v1` to return a CodeOutput
-    # pointing to a file with a syntax error.
+    # The live Coder compile-checks its output and retries, so it never
+    # hands a syntax error to the auditors. This test mocks
+    # `initialize_live_coder_agent` to return a CodeOutput pointing to a
+    # file with a syntax error instead.
     monkeypatch,
 ):
     """
-    Tests the V1 E2E workflow where the Auditor correctly reports a failure
-    due to a syntax error in the code produced by the Coder.
+    Tests the V1 E2E workflow where the syntax Auditor correctly reports a
+    failure due to a syntax error in the code produced by the Coder, and
+    the commission ends with AuditFailure.
     """
     user_prompt = "Create a python program with a syntax error."
     # The actual planner will generate a generic plan for this.
     # We will then intercept the call to the coder to make it produce bad code.
 
-    commission_dir = COMMISSION_WORK_BASE_DIR / unique_commission_id
     commission_dir.mkdir(
         parents=True, exist_ok=True
     )  # Ensure dir exists for bad_code_file
 
     bad_code_filename = "syntax_error.py"
     bad_code_file_path = commission_dir / bad_code_filename
-    with open(bad_code_file_path, "w") as f:
-        f.write("print 'this is a syntax error in Python 3'\n")
+    bad_code_file_path.write_text("print 'this is a syntax error in Python 3'\n")
 
     # Mock the Coder to return the path to this bad file
-    # We need to import CodeOutput for this mock
-    from gandalf_workshop.specs.data_models import CodeOutput
-    from gandalf_workshop.artisan_guildhall import (
-        artisans,
-    )  # to get the original function
-
-    original_coder = artisans.initialize_coder_agent_v1
-
-    def mock_initialize_coder_agent_v1(
-        plan_input, commission_id, output_target_dir
-    ):  # Changed commission_id_arg to commission_id
+    def mock_initialize_live_coder_agent(
+        plan_input,
+        commission_id,
+        output_target_dir_base,
+        llm_config=None,
+        prompt_charter_override=None,
+    ):
         # Log that mock is called
-        print(
-            f"MOCK initialize_coder_agent_v1 called for {commission_id} with target {output_target_dir}"
+        logger.info(
+            f"MOCK initialize_live_coder_agent called for {commission_id} with base {output_target_dir_base}"
         )
-        # It should still create the file in the designated output_target_dir
         # The file is already created above, this mock just returns its path.
-        return CodeOutput(
+        # Only .code_path and .message are read downstream, so a plain
+        # namespace stands in for a validated CodeOutput.
+        return SimpleNamespace(
             code_path=bad_code_file_path,
             message="Coder intentionally produced code with syntax error (mocked).",
         )
 
+    # Patch the name workshop_manager imported, not the artisans original.
     monkeypatch.setattr(
-        "gandalf_workshop.workshop_manager.initialize_coder_agent_v1",
-        mock_initialize_coder_agent_v1,
+        workshop_manager,
+        "initialize_live_coder_agent",
+        mock_initialize_live_coder_agent,
     )
-    # Alternative: monkeypatch.setattr(artisans, "initialize_coder_agent_v1", mock_initialize_coder_agent_v1)
-    # but workshop_manager has its own import.
-
-    # but workshop_manager has its own import.
+    # Every attempt would fail the same way; one is enough.
+    monkeypatch.setattr(manager_v1, "MAX_TOTAL_ATTEMPTS", 1)
 
-    # Run the commission and expect an exception
+    # Run the commission and expect it to run out of attempts
     caplog.set_level(
         logging.INFO
     )  # Set overall level for caplog to capture INFO from all relevant loggers
-    with pytest.raises(Exception) as excinfo:
+    with pytest.raises(AuditFailure) as excinfo:
         manager_v1.run_v1_commission(user_prompt, unique_commission_id)
 
     # Assertions
-    # 1. Exception message should indicate audit failure
-    assert "Audit failed" in str(excinfo.value)
-    # The actual auditor should report a syntax error
-    assert "Syntax error:" in str(excinfo.value)  # From initialize_auditor_agent_v1
+    # 1. The failure carries the syntax audit, whose message is the
+    # auditor's own (from initialize_auditor_agent_v1)
+    assert excinfo.value.commission_id == unique_commission_id
+    assert excinfo.value.audit_output.status == AuditStatus.FAILURE
+    assert excinfo.value.last_failure_message.startswith(
+        f"Syntax error in {bad_code_filename}:"
+    )
 
     # 2. Check logs
     log_text = caplog.text  # Use caplog.text
-    # The print from the mock coder will still go to stdout/stderr if not configured otherwise
-    captured_stdout_stderr = capsys.readouterr()
 
-    assert (
-        f"===== Starting V1 Workflow for Commission: {unique_commission_id} ====="
-        in log_text  # Check against log_text
+    # Coder log (from the mock, which logs through this module's logger)
+    assert any(
+        r.name == __name__
+        and r.getMessage().startswith("MOCK initialize_live_coder_agent called")
+        for r in caplog.records
     )
-    # Planner log will be for the generic plan for "Create a python program with a syntax error."
-    assert "Planner Agent returned plan:" in log_text  # Check against log_text
-
-    # Coder log (from the mock - this part is tricky as the mock uses print)
-    # The "MOCK initialize_coder_agent_v1 called..." message from the mock coder's print()
-    # will be in captured_stdout_stderr.out, not caplog.text.
-    assert "MOCK initialize_coder_agent_v1 called" in captured_stdout_stderr.out
-    # The WorkshopManager's log about the coder completing will be in caplog.text
-    assert f"Coder Agent completed. Code path: {bad_code_file_path}" in log_text
-    assert "Coder intentionally produced code with syntax error (mocked)." in log_text
-
-    # Auditor log should show failure
-    assert "Auditor Agent reported:" in log_text  # Check against log_text
-    assert f"{AuditStatus.FAILURE.value}" in log_text  # Check against log_text
-    # Example from auditor: "Syntax error: Missing parentheses in call to 'print'. Did you mean print(...)? (<unknown>, line 1)"
-    assert "Syntax error" in log_text  # Actual error message from auditor (in log_text)
 
-    assert (
-        f"Commission '{unique_commission_id}' failed audit."
-        in log_text  # Check against log_text
+    _assert_logged(
+        log_text,
+        [
+            f"===== Starting V1 Workflow for Commission: {unique_commission_id} =====",
+            # Planner log will be for the generic plan for the prompt.
+            "Initial Planner Agent returned plan:",
+            # The WorkshopManager's log about the (mocked) coder completing
+            f"Coder Agent completed. Path: {bad_code_file_path}",
+            "Coder intentionally produced code with syntax error (mocked).",
+            # Syntax auditor log should show failure, with the auditor's own
+            # message, e.g. "Syntax error in syntax_error.py: Missing
+            # parentheses in call to 'print'. ..."
+            "Syntax Auditor: Status:",
+            f"{AuditStatus.FAILURE.value}",
+            "Syntax error",
+            f"FAILED for '{unique_commission_id}'.",
+            f"Commission '{unique_commission_id}' exceeded MAX_TOTAL_ATTEMPTS",
+        ],
     )
     assert (
-        f"===== V1 Workflow for Commission: {unique_commission_id} Completed Successfully ====="
+        f"===== V1 Workflow for Commission: {unique_commission_id} Completed Successfully"
         not in log_text  # Check against log_text
     )
 
-    # Restore original coder if other tests in the same session need it
-    # monkeypatch automatically handles teardown, so this might not be strictly necessary
-    # but good for clarity if needed.
-    # monkeypatch.setattr(artisans, "initialize_coder_agent_v1", original_coder)
+    # monkeypatch restores the original coder on teardown.
 
 
 # The dummy test can be removed or kept if useful for verifying fixture setup.
@@ -4,18 +4,4 @@ from gandalf_workshop.final_framework_validation import main as feature_main
 
 def test_feature_main_runs_and_returns_expected_message():
     # Call the main function from the scaffolded feature to get coverage
-    expected_message = "Hello from final_framework_validation!"
-    try:
-        result = feature_main()
-        assert (
-            result == expected_message
-        ), f"Expected '{expected_message}', got '{result}'"
-    except Exception as e:
-        assert False, f"feature_main() raised an exception: {e}"
-
-
-def test_another_placeholder():
-    # Add more unit tests as needed for initial coverage
-    x = 10
-    y = 20
-    assert x + y == 30, "Basic arithmetic check"
+    assert feature_main() == "Hello from final_framework_validation!"
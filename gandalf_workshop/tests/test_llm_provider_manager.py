@@ -1,38 +1,74 @@
 import pytest
 import os
-from unittest import mock  # Still needed for os.environ mocking
 from pathlib import Path
+from types import SimpleNamespace
 
+from dotenv import dotenv_values
+
+from gandalf_workshop import llm_provider_manager
 from gandalf_workshop.llm_provider_manager import LLMProviderManager
 
-# Mock classes for API clients are removed as we are using live APIs.
+# Live API tests are marked `live` and deselected by default (see pytest.ini);
+# the mocked tests below cover the same paths without network access.
+
+# Environment variables LLMProviderManager reads provider API keys from.
+PROVIDER_KEY_VARS = ("GEMINI_API_KEY", "TOGETHER_AI_API_KEY", "MISTRAL_API_KEY")
+
+# Provider name -> LLMProviderManager attribute holding its API key.
+PROVIDER_KEY_ATTRS = {
+    "gemini": "gemini_api_key",
+    "together_ai": "together_api_key",
+    "mistral": "mistral_api_key",
+}
+
+# Provider name -> environment variable holding its API key.
+PROVIDER_KEY_ENV = dict(zip(PROVIDER_KEY_ATTRS, PROVIDER_KEY_VARS))
+
+# Keys set in the environment or in .env, resolved once at collection time so
+# live tests without a key are skipped before any LLMProviderManager is built.
+_dotenv_keys = dotenv_values()
+CONFIGURED_KEY_VARS = frozenset(
+    k for k in PROVIDER_KEY_VARS if os.environ.get(k) or _dotenv_keys.get(k)
+)
+
+
+def requires_any_key(*key_vars):
+    """Skips a live test unless at least one of key_vars is configured."""
+    return pytest.mark.skipif(
+        CONFIGURED_KEY_VARS.isdisjoint(key_vars),
+        reason=f"No {' or '.join(key_vars)} configured, skipping live test.",
+    )
+
+
+def _disable_dotenv(monkeypatch):
+    """Stops LLMProviderManager from (re)loading keys out of a local .env file."""
+    monkeypatch.setattr(llm_provider_manager, "load_dotenv", lambda *a, **k: None)
 
 
 # Fixtures to manipulate os.environ for testing different key availability scenarios
-@pytest.fixture
+@pytest.fixture(scope="session")
 def manager_with_all_keys_env():
     # This fixture ensures that when LLMProviderManager is instantiated,
     # it will find all necessary keys in the environment IF they are in the .env file.
     # No os.environ patching here, relies on .env being loaded by LLMProviderManager.
     # If .env is missing keys, this test might behave like specific keys are missing.
+    # Session-scoped: one manager (and one load_dotenv) is shared by every live
+    # test, so tests must only read its attributes and call get_llm_provider.
     manager = LLMProviderManager()
     yield manager
 
 
 @pytest.fixture
-def manager_with_no_keys_env():
+def manager_with_no_keys_env(monkeypatch):
     # This fixture simulates an environment where NO API keys are set.
-    with mock.patch.dict(os.environ, {}, clear=True):
-        # Crucially, also prevent .env loading for this specific manager instance
-        with mock.patch(
-            "gandalf_workshop.llm_provider_manager.load_dotenv"
-        ) as m_load_dotenv:
-            m_load_dotenv.return_value = None  # Pretend .env was not loaded or empty
-            manager = LLMProviderManager()
-            yield manager
+    for key_var in PROVIDER_KEY_VARS:
+        monkeypatch.delenv(key_var, raising=False)
+    # Crucially, also prevent .env loading for this specific manager instance
+    _disable_dotenv(monkeypatch)
+    return LLMProviderManager()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def manager_with_gemini_only_env():
     # Simulates only Gemini key being present.
     # Assumes GEMINI_API_KEY is in the .env, and we clear others.
@@ -57,9 +93,107 @@ def manager_with_gemini_only_env():
     yield manager
 
 
+# --- Mocked SDK Tests (default) ---
+
+FAKE_MODELS = ["fake-model-a", "fake-model-b"]
+
+
+def _fake_model(model_id):
+    # Carries every attribute the Gemini, Together and Mistral listings read.
+    return SimpleNamespace(
+        id=model_id,
+        name=model_id,
+        supported_generation_methods=["generateContent"],
+    )
+
+
+@pytest.fixture
+def mocked_sdks(monkeypatch):
+    """
+    Replaces the provider SDK entry points used by LLMProviderManager with
+    in-memory fakes that list FAKE_MODELS. Returns the fake genai module so a
+    test can make Gemini misbehave.
+    """
+    models = [_fake_model(m) for m in FAKE_MODELS]
+    fake_genai = SimpleNamespace(
+        configure=lambda **kwargs: None, list_models=lambda: models
+    )
+    monkeypatch.setattr(llm_provider_manager, "genai", fake_genai)
+    monkeypatch.setattr(
+        llm_provider_manager,
+        "Together",
+        lambda api_key: SimpleNamespace(models=SimpleNamespace(list=lambda: models)),
+    )
+    monkeypatch.setattr(
+        llm_provider_manager,
+        "Mistral",
+        lambda api_key: SimpleNamespace(
+            models=SimpleNamespace(list=lambda: SimpleNamespace(data=models))
+        ),
+    )
+    return fake_genai
+
+
+@pytest.fixture
+def mocked_manager(monkeypatch, mocked_sdks):
+    """An LLMProviderManager with fake keys for every provider and mocked SDKs."""
+    for key_var in PROVIDER_KEY_VARS:
+        monkeypatch.setenv(key_var, f"fake-{key_var.lower()}")
+    _disable_dotenv(monkeypatch)
+    return LLMProviderManager()
+
+
+@pytest.mark.parametrize("provider, key_attr", list(PROVIDER_KEY_ATTRS.items()))
+def test_get_llm_provider_success(mocked_manager, provider, key_attr):
+    provider_info = mocked_manager.get_llm_provider(preferred_provider=provider)
+    assert provider_info is not None
+    assert provider_info["provider_name"] == provider
+    assert provider_info["api_key"] == getattr(mocked_manager, key_attr)
+    assert provider_info["models"] == FAKE_MODELS
+    assert provider_info["client"] is not None
+    assert mocked_manager.provider_models[provider] == FAKE_MODELS
+
+
+def test_get_llm_provider_fallback(mocked_manager, mocked_sdks, monkeypatch):
+    """A failing preferred provider falls back to the first working one in order."""
+
+    def _unavailable():
+        raise RuntimeError("Gemini unavailable")
+
+    monkeypatch.setattr(mocked_sdks, "list_models", _unavailable)
+    provider_info = mocked_manager.get_llm_provider(preferred_provider="gemini")
+    assert provider_info is not None
+    assert provider_info["provider_name"] == "mistral"
+
+
+def test_get_llm_provider_no_preference_order(mocked_manager):
+    """With every provider working and no preference, Mistral is checked first."""
+    provider_info = mocked_manager.get_llm_provider()
+    assert provider_info is not None
+    assert provider_info["provider_name"] == "mistral"
+
+
 # --- Live API Tests ---
 
 
+@pytest.fixture(scope="session")
+def live_providers(manager_with_all_keys_env):
+    # get_llm_provider makes a live model-list call per provider, so resolve each
+    # provider once per session and let the per-provider tests read the cache.
+    # Providers without a key map to None rather than triggering a fallback scan.
+    manager = manager_with_all_keys_env
+    return {
+        name: (
+            manager.get_llm_provider(preferred_provider=name)
+            if getattr(manager, key_attr)
+            else None
+        )
+        for name, key_attr in PROVIDER_KEY_ATTRS.items()
+    }
+
+
+@pytest.mark.live
+@requires_any_key("GEMINI_API_KEY")
 def test_llm_provider_manager_init_loads_keys_from_env(manager_with_all_keys_env):
     """Test that LLMProviderManager loads keys from .env if present."""
     # This test implicitly checks if keys are loaded by checking attributes.
@@ -72,20 +206,27 @@ def test_llm_provider_manager_init_loads_keys_from_env(manager_with_all_keys_env
     # For now, we just ensure the manager initializes.
 
 
-def test_get_llm_provider_gemini_live_success(manager_with_all_keys_env):
-    """Test successful Gemini provider retrieval with live API."""
-    manager = manager_with_all_keys_env
-    if not manager.gemini_api_key:
-        pytest.skip("GEMINI_API_KEY not found in environment, skipping live test.")
-
-    provider_info = manager.get_llm_provider(preferred_provider="gemini")
+@pytest.mark.live
+@pytest.mark.parametrize(
+    "provider, key_attr",
+    [
+        pytest.param(name, key_attr, marks=requires_any_key(PROVIDER_KEY_ENV[name]))
+        for name, key_attr in PROVIDER_KEY_ATTRS.items()
+    ],
+)
+def test_get_llm_provider_live_success(
+    manager_with_all_keys_env, live_providers, provider, key_attr
+):
+    """Test successful provider retrieval with live API, per provider."""
+    api_key = getattr(manager_with_all_keys_env, key_attr)
+    provider_info = live_providers[provider]
     assert provider_info is not None
-    assert provider_info["provider_name"] == "gemini"
-    assert provider_info["api_key"] == manager.gemini_api_key
+    assert provider_info["provider_name"] == provider
+    assert provider_info["api_key"] == api_key
     assert len(provider_info["models"]) > 0
     # Client object type check depends on the actual client library
     assert provider_info["client"] is not None
-    print(f"Found Gemini models: {provider_info['models'][:5]}")
+    print(f"Found {provider} models: {provider_info['models'][:5]}")
 
 
 def test_get_llm_provider_no_keys_live(manager_with_no_keys_env):
@@ -95,67 +236,26 @@ def test_get_llm_provider_no_keys_live(manager_with_no_keys_env):
     assert provider_info is None
 
 
-def test_get_llm_provider_together_ai_live_success(manager_with_all_keys_env):
-    manager = manager_with_all_keys_env
-    if not manager.together_api_key:
-        pytest.skip("TOGETHER_AI_API_KEY not found in environment, skipping live test.")
-
-    provider_info = manager.get_llm_provider(preferred_provider="together_ai")
-    assert provider_info is not None
-    assert provider_info["provider_name"] == "together_ai"
-    assert provider_info["api_key"] == manager.together_api_key
-    assert len(provider_info["models"]) > 0
-    assert provider_info["client"] is not None
-    print(f"Found Together AI models: {provider_info['models'][:5]}")
-
-
-def test_get_llm_provider_mistral_live_success(manager_with_all_keys_env):
-    manager = manager_with_all_keys_env
-    if not manager.mistral_api_key:
-        pytest.skip("MISTRAL_API_KEY not found in environment, skipping live test.")
+def test_get_llm_provider_gemini_simulated_missing_key(monkeypatch):
+    # Simulate Gemini key missing and no other keys available for fallback:
+    # an empty Gemini key, and empty Together/Mistral keys so nothing falls back.
+    for key_var in PROVIDER_KEY_VARS:
+        monkeypatch.setenv(key_var, "")
+    _disable_dotenv(monkeypatch)  # Prevent .env loading
 
-    provider_info = manager.get_llm_provider(preferred_provider="mistral")
-    assert provider_info is not None
-    assert provider_info["provider_name"] == "mistral"
-    assert provider_info["api_key"] == manager.mistral_api_key
-    assert len(provider_info["models"]) > 0
-    assert provider_info["client"] is not None
-    print(f"Found Mistral models: {provider_info['models'][:5]}")
+    manager = LLMProviderManager()
+    assert manager.gemini_api_key == ""
+    assert manager.together_api_key == ""
+    assert manager.mistral_api_key == ""
+    provider_info = manager.get_llm_provider(preferred_provider="gemini")
+    assert provider_info is None  # Gemini should fail, and no fallback should occur
 
 
-def test_get_llm_provider_gemini_simulated_missing_key():
-    # Simulate Gemini key missing and no other keys available for fallback.
-    env_vars_for_test = {
-        "GEMINI_API_KEY": "",  # Empty key
-        "TOGETHER_AI_API_KEY": "",  # Ensure no fallback
-        "MISTRAL_API_KEY": "",  # Ensure no fallback
-    }
-    with mock.patch.dict(
-        os.environ, env_vars_for_test, clear=True
-    ):  # clear=True ensures only these are set
-        with mock.patch(
-            "gandalf_workshop.llm_provider_manager.load_dotenv"
-        ) as m_load_dotenv:
-            m_load_dotenv.return_value = None  # Prevent .env loading
-            manager = LLMProviderManager()
-            assert manager.gemini_api_key == ""
-            assert manager.together_api_key == ""
-            assert manager.mistral_api_key == ""
-            provider_info = manager.get_llm_provider(preferred_provider="gemini")
-            assert (
-                provider_info is None
-            )  # Gemini should fail, and no fallback should occur
-
-
-def test_get_llm_provider_fallback_live(manager_with_all_keys_env):
+@pytest.mark.live
+@requires_any_key("TOGETHER_AI_API_KEY", "MISTRAL_API_KEY")  # Need one fallback
+def test_get_llm_provider_fallback_live(manager_with_all_keys_env, monkeypatch):
     """Test fallback if a preferred (but simulated failing) provider is chosen."""
-    manager = manager_with_all_keys_env
-    if (
-        not manager.together_api_key and not manager.mistral_api_key
-    ):  # Need at least one fallback
-        pytest.skip(
-            "Neither Together AI nor Mistral API keys found, skipping fallback test."
-        )
+    # manager_with_all_keys_env has already loaded .env into os.environ.
 
     # Simulate Gemini key being present but calls to its API failing
     # This requires mocking the genai client's methods to raise an exception
@@ -171,51 +271,29 @@ def test_get_llm_provider_fallback_live(manager_with_all_keys_env):
     # Let's simplify: if Gemini key is present, try to make it "fail" by unsetting it,
     # then see if it falls back to Together or Mistral (if their keys are present).
 
-    original_gemini_key = os.environ.get("GEMINI_API_KEY")
-    try:
-        if "GEMINI_API_KEY" in os.environ:
-            del os.environ["GEMINI_API_KEY"]  # Temporarily remove Gemini key
-
-        # Re-initialize manager in this modified environment
-        # Must also mock load_dotenv for this specific instantiation
-        with mock.patch(
-            "gandalf_workshop.llm_provider_manager.load_dotenv"
-        ) as m_load_dotenv:
-            m_load_dotenv.return_value = None  # Prevent reloading from .env
-            current_manager = LLMProviderManager()
-
-        # Check if any key was actually loaded by current_manager. If .env was empty, this might be all None.
-        if not current_manager.together_api_key and not current_manager.mistral_api_key:
-            pytest.skip(
-                "No fallback keys (Together/Mistral) available in .env for live fallback test."
-            )
-
-        provider_info = current_manager.get_llm_provider(
-            preferred_provider="gemini"
-        )  # Prefer failing Gemini
-
-        assert provider_info is not None
-        assert provider_info["provider_name"] != "gemini"  # Should not be Gemini
-        assert provider_info["provider_name"] in ["together_ai", "mistral"]
-        print(f"Fallback successful to: {provider_info['provider_name']}")
-
-    finally:
-        # Restore Gemini key if it was removed
-        if original_gemini_key is not None:
-            os.environ["GEMINI_API_KEY"] = original_gemini_key
-        elif (
-            "GEMINI_API_KEY" in os.environ
-        ):  # If it was set to "" by a previous test and not restored
-            del os.environ["GEMINI_API_KEY"]
+    # monkeypatch restores GEMINI_API_KEY (and load_dotenv) on teardown.
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    # Re-initialize manager in this modified environment
+    # Must also disable load_dotenv so the key isn't reloaded from .env
+    _disable_dotenv(monkeypatch)
+    current_manager = LLMProviderManager()
+
+    provider_info = current_manager.get_llm_provider(
+        preferred_provider="gemini"
+    )  # Prefer failing Gemini
+
+    assert provider_info is not None
+    assert provider_info["provider_name"] != "gemini"  # Should not be Gemini
+    assert provider_info["provider_name"] in ["together_ai", "mistral"]
+    print(f"Fallback successful to: {provider_info['provider_name']}")
 
 
+@pytest.mark.live
+@requires_any_key(*PROVIDER_KEY_VARS)
 def test_get_llm_provider_no_preference_live_order(manager_with_all_keys_env):
     """Test it picks a provider if all keys are present and no preference given."""
     manager = manager_with_all_keys_env
-    if not (
-        manager.gemini_api_key or manager.together_api_key or manager.mistral_api_key
-    ):
-        pytest.skip("No API keys found in .env, skipping no_preference test.")
 
     provider_info = manager.get_llm_provider()
     assert provider_info is not None
@@ -225,8 +303,9 @@ def test_get_llm_provider_no_preference_live_order(manager_with_all_keys_env):
     assert provider_info["provider_name"] in ["gemini", "together_ai", "mistral"]
 
 
-# Note: These tests will make actual API calls. Ensure API keys in .env are valid
-# and you have the necessary quotas/access for the services.
+# Note: Tests marked `live` make actual API calls and only run with `-m live`.
+# Ensure API keys in .env are valid and you have the necessary quotas/access
+# for the services.
 # Some tests might be skipped if keys are not found.
 # Testing specific API error handling (like 500 errors) is not covered here
 # as it's hard to reliably reproduce with live APIs.
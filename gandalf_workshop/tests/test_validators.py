@@ -0,0 +1,155 @@
+import ast
+
+import pytest
+
+from gandalf_workshop import validators
+
+# An unused import: flake8 reports F401 unless the config in the working
+# directory ignores it.
+_UNUSED_IMPORT_SOURCE = "import os\n"
+
+
+@pytest.fixture
+def flake8_dirs(tmp_path, monkeypatch):
+    """
+    Two working directories, one whose .flake8 ignores F401 and one with no
+    config, plus a module with an unused import outside both. Each test
+    starts without cached in-process style guides.
+    """
+    ignoring = tmp_path / "ignores_f401"
+    ignoring.mkdir()
+    (ignoring / ".flake8").write_text("[flake8]\nextend-ignore = F401\n")
+    plain = tmp_path / "no_config"
+    plain.mkdir()
+    module = tmp_path / "module.py"
+    module.write_text(_UNUSED_IMPORT_SOURCE)
+    monkeypatch.setattr(validators, "_flake8_style_guides", {})
+    return ignoring, plain, module
+
+
+def test_in_process_flake8_matches_subprocess_per_working_directory(
+    flake8_dirs, monkeypatch
+):
+    """
+    The in-process run reads flake8's config from the current directory, as
+    the subprocess does, rather than keeping the config it first saw.
+    """
+    ignoring, plain, module = flake8_dirs
+    to_check = {str(module): module}
+
+    monkeypatch.chdir(ignoring)
+    in_process = validators._run_flake8_in_process(to_check)
+    assert in_process == validators._run_flake8_subprocess(to_check)
+    assert in_process[module] == (True, [])
+
+    monkeypatch.chdir(plain)
+    in_process = validators._run_flake8_in_process(to_check)
+    assert in_process == validators._run_flake8_subprocess(to_check)
+    assert in_process[module] == (
+        False,
+        [f"{module}:1:1: F401 'os' imported but unused"],
+    )
+
+
+@pytest.mark.parametrize("in_process", [True, False], ids=["in_process", "subprocess"])
+def test_flake8_batch_reports_each_path_separately(tmp_path, monkeypatch, in_process):
+    """
+    One batch run attributes errors to the file they came from, reports
+    missing files without running flake8 on them, and turns syntax errors
+    into E999.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(validators, "_flake8_style_guides", {})
+    monkeypatch.setattr(validators, "_flake8_importable", lambda: in_process)
+    clean = tmp_path / "clean.py"
+    clean.write_text("x = 1\n")
+    spacing = tmp_path / "spacing.py"
+    spacing.write_text("x=1\n")
+    broken = tmp_path / "broken.py"
+    broken.write_text("def f(:\n    pass\n")
+    missing = tmp_path / "missing.py"
+
+    results = validators.run_flake8_validation_batch([clean, spacing, broken, missing])
+
+    assert results[clean] == (True, [])
+    assert results[spacing] == (
+        False,
+        [f"{spacing}:1:2: E225 missing whitespace around operator"],
+    )
+    broken_ok, broken_errors = results[broken]
+    assert not broken_ok
+    assert len(broken_errors) == 1
+    assert broken_errors[0].startswith(f"{broken}:1:")
+    assert " E999 SyntaxError" in broken_errors[0]
+    assert results[missing] == (
+        False,
+        [f"File not found for flake8 validation: {missing}"],
+    )
+
+
+def test_statement_counter_stops_at_the_limit():
+    """
+    The counter raises _EnoughStatements as soon as it reaches its limit,
+    without visiting the rest of the tree.
+    """
+    tree = ast.parse("\n".join(f"x{i} = {i}" for i in range(100)))
+    counter = validators._StatementCounter(3)
+    with pytest.raises(validators._EnoughStatements):
+        counter.visit(tree)
+    assert counter.count == 3
+
+
+def test_statement_counter_counts_nested_statements_only():
+    """
+    Statements nested in bodies and except handlers are counted; the
+    expressions around them (decorators, arguments) are not descended into.
+    """
+    source = (
+        "@decorator(lambda: None)\n"
+        "def f():\n"
+        "    try:\n"
+        "        return 1\n"
+        "    except ValueError:\n"
+        "        raise\n"
+    )
+    counter = validators._StatementCounter(100)
+    counter.visit(ast.parse(source))
+    # FunctionDef, Try, Return, Raise.
+    assert counter.count == 4
+
+
+@pytest.mark.skipif(
+    not hasattr(ast, "match_case"), reason="match statements need Python 3.10+"
+)
+def test_statement_counter_counts_statements_in_match_cases():
+    source = "match x:\n    case 1:\n        y = 1\n    case _:\n        y = 2\n"
+    counter = validators._StatementCounter(100)
+    counter.visit(ast.parse(source))
+    # The two assignments; Match itself is not a counted statement type.
+    assert counter.count == 2
+
+
+def test_trivial_code_is_rejected_without_parsing():
+    """
+    Code that fails the line-count check is never parsed, so even a syntax
+    error there is reported only as too trivial.
+    """
+    validator = validators.CodeStructureValidator("def f(:\n")
+
+    assert not validator.check_non_trivial()
+    assert not validator._parsed
+    assert validator.parse_error is None
+    assert validator.errors[0].startswith("Code seems too trivial: less than 10")
+
+
+def test_unparseable_code_reports_its_syntax_error():
+    source = "x = (\n" + "y = 1\n" * 10
+    validator = validators.CodeStructureValidator(source)
+
+    assert not validator.check_non_trivial()
+    assert validator.tree is None
+    assert isinstance(validator.parse_error, SyntaxError)
+    assert validator.errors == [
+        "Syntax error during non-trivial check (AST parsing): "
+        f"{validator.parse_error}"
+    ]
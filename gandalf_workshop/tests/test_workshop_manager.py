@@ -1,10 +1,18 @@
+import asyncio
+import hashlib
 import pytest
-import shutil
 import logging  # Added for caplog.set_level
-from pathlib import Path
-from unittest.mock import patch
-
-from gandalf_workshop.workshop_manager import WorkshopManager
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import nullcontext
+from types import SimpleNamespace
+from typing import NamedTuple, Optional, Pattern
+from unittest.mock import Mock
+
+from gandalf_workshop import workshop_manager
+from gandalf_workshop.workshop_manager import AuditFailure, WorkshopManager
 from gandalf_workshop.specs.data_models import (
     PlanOutput,
     CodeOutput,
@@ -15,34 +23,176 @@ from gandalf_workshop.specs.data_models import (
 TEST_COMMISSION_ID = "test_v1_commission_001"
 HELLO_WORLD_PROMPT = "Create a hello world program in Python."
 OTHER_PROMPT = "Create something else."
+OTHER_TASK_DESCRIPTION = f"Task based on: {OTHER_PROMPT}"
+
+# Planner outputs shared by the cases below. The tests only read them, so one
+# instance each is built at import instead of one per test run.
+_HELLO_WORLD_PLAN = PlanOutput(
+    tasks=["Create a Python file that prints 'Hello, World!'"]
+)
+_GENERIC_PLAN = PlanOutput(tasks=["Some generic task"])
+_OTHER_PROMPT_PLAN = PlanOutput(tasks=[OTHER_TASK_DESCRIPTION])
+
+# Expected WorkshopManager log lines, formatted per test and matched in order
+# as prefixes of the captured log messages.
+_LOG_START = "===== Starting V1 Workflow for Commission: {cid} ====="
+_LOG_INVOKE_PLANNER = (
+    "Workshop Manager: Invoking Initial Live Planner Agent for '{cid}'."
+)
+_LOG_PLANNER_DONE = "Workshop Manager: Initial Planner Agent returned plan:"
+_LOG_ATTEMPT = "Workshop Manager: Overall Attempt 1/1, Strategy: DEFAULT"
+_LOG_CODER_DONE = (
+    "Workshop Manager: Coder Agent completed. Path: {path}, Msg: {message}"
+)
+_LOG_SYNTAX_AUDITOR = "Syntax Auditor: Status: {status!s}, Msg: {message}"
+_LOG_LIVE_AUDITOR = "Live Auditor: Status: {status!s}, Msg: {message}"
+_LOG_PASSED = "Commission '{cid}' PASSED with strategy 'DEFAULT' on overall attempt 1."
+_LOG_FAILED_ATTEMPT = (
+    "Attempt 1 for strategy 'DEFAULT' FAILED for '{cid}'. Last error: {reason}"
+)
+_LOG_OUT_OF_ATTEMPTS = "Commission '{cid}' exceeded MAX_TOTAL_ATTEMPTS (1). Aborting."
+_LOG_COMPLETED = "===== V1 Workflow for Commission: {cid} Completed Successfully"
+
+# Planner log message for the hello-world plan, searched for in each captured
+# message. Only the key content is matched, since the truncated str() of the
+# task list isn't stable.
+_PLANNER_LOG_RE = re.compile(
+    r"Workshop Manager: Initial Planner Agent returned plan:.*?Create a Python file that prints 'Hello, Wor",
+    re.DOTALL,
+)
+
+# The syntax audit every case passes; the cases differ in the live audit.
+_SYNTAX_OK = AuditOutput(status=AuditStatus.SUCCESS, message="Syntax OK.")
+# The live Coder writes its code to <commission dir>/<UTC timestamp>/.
+_CODER_RUN_DIR = "2026-01-01_00-00-00"
+_CODER_FILENAME = "generated_code.py"
+_CODER_SUCCESS_MESSAGE = "Successfully generated code."
+
+# Stand-in provider config: the agents are mocked, so it is never used to
+# reach a provider, only passed through to them.
+_MOCK_LLM_CONFIG = {"provider_name": "mock_provider"}
+
 
+class CommissionCase(NamedTuple):
+    """One mocked V1 commission: agent outputs and what the manager should do."""
 
-@pytest.fixture(scope="function")
-def manager():
-    """Provides a WorkshopManager instance for V1 tests."""
-    return WorkshopManager()
+    prompt: str
+    plan: PlanOutput
+    code_content: str  # Content of the file the (mocked) Coder "creates"
+    audit: AuditOutput  # Live audit; the syntax audit always passes
+    planner_log_re: Optional[Pattern] = None
+
+
+HELLO_WORLD_CASE = CommissionCase(
+    prompt=HELLO_WORLD_PROMPT,
+    plan=_HELLO_WORLD_PLAN,
+    code_content="print('Hello, World!')\n",
+    audit=AuditOutput(
+        status=AuditStatus.SUCCESS, message="Mock Auditor: Audit passed."
+    ),
+    planner_log_re=_PLANNER_LOG_RE,
+)
+
+AUDIT_FAILURE_CASE = CommissionCase(
+    prompt=OTHER_PROMPT,
+    plan=_GENERIC_PLAN,
+    code_content="print('Content for generic task.')\n",
+    audit=AuditOutput(
+        status=AuditStatus.FAILURE,
+        message="Mock Auditor: Critical security flaw detected!",
+    ),
+)
+
+OTHER_PROMPT_CASE = CommissionCase(
+    prompt=OTHER_PROMPT,
+    plan=_OTHER_PROMPT_PLAN,
+    code_content=f"print({OTHER_TASK_DESCRIPTION!r})\n",
+    audit=AuditOutput(
+        status=AuditStatus.SUCCESS,
+        message="Mock Auditor: Audit passed for generic content.",
+    ),
+)
 
 
-@pytest.fixture(scope="function", autouse=True)
-def cleanup_commission_work_dir():
-    """Cleans up the commission work directory before and after each test."""
-    work_dir_base = Path("gandalf_workshop/commission_work")
+def _logged(messages, prefix):
+    return any(m.startswith(prefix) for m in messages)
 
-    # Clean before test, if it exists from a previous failed run
-    test_specific_dir = work_dir_base / TEST_COMMISSION_ID
-    if test_specific_dir.exists():
-        shutil.rmtree(test_specific_dir)
 
-    yield  # This is where the test runs
+def _assert_logged(messages, *prefixes):
+    """
+    Asserts the prefixes were logged in the given order, in one pass over
+    messages: each search resumes after the previous match.
+    """
+    remaining = iter(messages)
+    for prefix in prefixes:
+        assert _logged(
+            remaining, prefix
+        ), f"Expected log message not found (in order): {prefix}"
+
+
+def _source(path):
+    """
+    The file's text and the SHA-256 hex digest the manager keys its audit
+    caches on, as run_v1_commission passes them to the auditors.
+    """
+    source = path.read_bytes()
+    return source.decode("utf-8"), hashlib.sha256(source).hexdigest()
+
+
+@pytest.fixture
+def manager(manager_v1, monkeypatch):
+    """
+    The session's shared manager_v1, which writes commissions under the
+    session-wide workshop_root (see conftest.py).
+
+    Sharing the instance is safe: run_v1_commission resets its strategy
+    counters per commission, and the tests write distinct output files.
+    Its plan and audit caches are emptied for each test, so no test reuses
+    another's results.
+    """
+    for cache in ("_plan_cache", "_syntax_audit_cache", "_live_audit_cache"):
+        monkeypatch.setattr(manager_v1, cache, {})
+    return manager_v1
+
+
+@pytest.fixture
+def commission_id(request):
+    """A per-test commission ID, so no two tests share an output directory."""
+    return f"{TEST_COMMISSION_ID}_{request.node.name}"
+
+
+class _AgentMocks(SimpleNamespace):
+    """The agent Mocks, plus one call to set what they return."""
+
+    def configure(self, *, planner, coder, auditor, live_auditor):
+        self.planner.return_value = planner
+        self.coder.return_value = coder
+        self.auditor.return_value = auditor
+        self.live_auditor.return_value = live_auditor
+
+
+@pytest.fixture
+def agent_mocks(manager, monkeypatch):
+    """
+    Swaps the agent entry points run_v1_commission calls (the live planner
+    and coder, and the syntax and live auditors) for plain Mocks via
+    monkeypatch and returns them as planner/coder/auditor/live_auditor.
 
-    # Clean after test
-    if test_specific_dir.exists():
-        shutil.rmtree(test_specific_dir)
-    # Clean up a generic dir too, if created by non-helloworld prompt tests
-    generic_commission_id = "v1_commission"  # default id in run_v1_commission
-    generic_dir = work_dir_base / generic_commission_id
-    if generic_dir.exists():
-        shutil.rmtree(generic_dir)
+    Also gives the shared manager a mock provider config.
+    """
+    mocks = _AgentMocks(
+        planner=Mock(), coder=Mock(), auditor=Mock(), live_auditor=Mock()
+    )
+    monkeypatch.setattr(
+        workshop_manager, "initialize_live_planner_agent", mocks.planner
+    )
+    monkeypatch.setattr(workshop_manager, "initialize_live_coder_agent", mocks.coder)
+    monkeypatch.setattr(workshop_manager, "initialize_auditor_agent_v1", mocks.auditor)
+    monkeypatch.setattr(
+        workshop_manager, "initialize_live_auditor_agent", mocks.live_auditor
+    )
+    monkeypatch.setattr(manager, "llm_config", dict(_MOCK_LLM_CONFIG))
+    return mocks
 
 
 def test_workshop_manager_v1_initialization(manager):
@@ -51,317 +201,580 @@ def test_workshop_manager_v1_initialization(manager):
     # V1 __init__ is very simple, mainly checking it doesn't error.
 
 
-@patch("gandalf_workshop.workshop_manager.initialize_planner_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_coder_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_auditor_agent_v1")
-def test_run_v1_commission_hello_world_success(
-    MockInitializeAuditorV1,
-    MockInitializeCoderV1,
-    MockInitializePlannerV1,
-    manager,
-    caplog,  # Changed from capsys
+@pytest.mark.parametrize(
+    "case",
+    [HELLO_WORLD_CASE, AUDIT_FAILURE_CASE, OTHER_PROMPT_CASE],
+    ids=["hello", "audit_fail", "other"],
+)
+def test_run_v1_commission_mocked_agents(
+    agent_mocks, manager, commission_id, caplog, monkeypatch, case
 ):
     """
-    Tests the V1 commission workflow for a 'hello world' prompt,
-    mocking all agent calls.
+    Tests the V1 commission workflow with all agent calls mocked, for a
+    passing hello-world run, a live audit failure, and a passing generic
+    prompt. Each commission gets a single attempt, so a failed audit ends
+    it with AuditFailure.
     """
+    MockInitializePlanner = agent_mocks.planner
+    MockInitializeCoder = agent_mocks.coder
+    MockInitializeAuditorV1 = agent_mocks.auditor
+    MockInitializeLiveAuditor = agent_mocks.live_auditor
+    audit_passes = case.audit.status == AuditStatus.SUCCESS
+    monkeypatch.setattr(manager, "MAX_TOTAL_ATTEMPTS", 1)
+
     # --- Configure Mocks ---
-    # 1. Planner Mock
-    mock_plan_instance = PlanOutput(
-        tasks=["Create a Python file that prints 'Hello, World!'"]
-    )
-    MockInitializePlannerV1.return_value = mock_plan_instance
-
-    # 2. Coder Mock
-    # The Coder agent is expected to create the file. For the unit test,
-    # we simulate this by having the mock return a CodeOutput pointing to the expected path
-    # and then we create this dummy file for assertion purposes.
-    commission_work_dir = Path("gandalf_workshop/commission_work") / TEST_COMMISSION_ID
-    # The actual coder agent creates 'main.py' for this plan
-    expected_code_filename = "main.py"
-    mock_code_path = commission_work_dir / expected_code_filename
-
-    # Ensure the directory exists for the mock file creation
-    commission_work_dir.mkdir(parents=True, exist_ok=True)
-    # Create a dummy file that the Coder agent would have created
-    with open(mock_code_path, "w") as f:
-        f.write("print('Hello, World!')\n")
+    # The live Coder writes into a timestamped directory under the
+    # commission directory. The mock returns a CodeOutput pointing at such a
+    # path, and the file is created here so the auditors have code to read.
+    commission_work_dir = manager.workshop_root / commission_id
+    mock_code_path = commission_work_dir / _CODER_RUN_DIR / _CODER_FILENAME
+    mock_code_path.parent.mkdir(parents=True, exist_ok=True)
+    mock_code_path.write_text(case.code_content)
 
     mock_code_output_instance = CodeOutput(
-        code_path=mock_code_path,
-        message="Mock Coder: Python 'Hello, World!' generated.",
+        code_path=mock_code_path, message=_CODER_SUCCESS_MESSAGE
     )
-    MockInitializeCoderV1.return_value = mock_code_output_instance
-
-    # 3. Auditor Mock
-    mock_audit_output_instance = AuditOutput(
-        status=AuditStatus.SUCCESS, message="Mock Auditor: Audit passed."
+    agent_mocks.configure(
+        planner=case.plan,
+        coder=mock_code_output_instance,
+        auditor=_SYNTAX_OK,
+        live_auditor=case.audit,
     )
-    MockInitializeAuditorV1.return_value = mock_audit_output_instance
 
     # --- Run the Commission ---
     caplog.set_level(
         logging.INFO, logger="gandalf_workshop.workshop_manager"
     )  # Set log level
-    result_path = manager.run_v1_commission(HELLO_WORLD_PROMPT, TEST_COMMISSION_ID)
+    expectation = nullcontext() if audit_passes else pytest.raises(AuditFailure)
+    with expectation as excinfo:
+        result_path = manager.run_v1_commission(case.prompt, commission_id)
+    if audit_passes:
+        assert result_path == mock_code_path  # Path returned by WorkshopManager
+        assert mock_code_path.read_text() == case.code_content
+    else:
+        assert str(excinfo.value) == (
+            f"Max total attempts reached for '{commission_id}'."
+        )
+        assert excinfo.value.audit_output is case.audit
+        assert excinfo.value.last_failure_message == case.audit.message
 
     # --- Assertions ---
-    # 1. Planner was called correctly
-    MockInitializePlannerV1.assert_called_once_with(
-        HELLO_WORLD_PROMPT, TEST_COMMISSION_ID
+    # 1. Planner was called once, for the initial plan
+    MockInitializePlanner.assert_called_once_with(
+        case.prompt, commission_id, llm_config=_MOCK_LLM_CONFIG
     )
 
-    # 2. Coder was called correctly
-    MockInitializeCoderV1.assert_called_once_with(
-        plan_input=mock_plan_instance,
-        commission_id=TEST_COMMISSION_ID,
-        output_target_dir=commission_work_dir,
+    # 2. Coder was called with the commission directory as its base
+    MockInitializeCoder.assert_called_once_with(
+        plan_input=case.plan,
+        commission_id=commission_id,
+        output_target_dir_base=commission_work_dir,
+        llm_config=_MOCK_LLM_CONFIG,
+        prompt_charter_override=None,
     )
-    assert result_path == mock_code_path  # Path returned by WorkshopManager
-    assert mock_code_path.exists()  # File created for the test
-    with open(mock_code_path, "r") as f:
-        content = f.read()
-        assert content == "print('Hello, World!')\n"
 
-    # 3. Auditor was called correctly
+    # 3. Both auditors were called on the Coder's output
     MockInitializeAuditorV1.assert_called_once_with(
-        code_input=mock_code_output_instance, commission_id=TEST_COMMISSION_ID
+        code_input=mock_code_output_instance,
+        commission_id=commission_id,
+        source_code=case.code_content,
+    )
+    MockInitializeLiveAuditor.assert_called_once_with(
+        generated_code=case.code_content,
+        plan_input=case.plan,
+        commission_id=commission_id,
+        llm_config=_MOCK_LLM_CONFIG,
     )
 
     # 4. Check logs
-    log_text = caplog.text
-    assert (
-        f"===== Starting V1 Workflow for Commission: {TEST_COMMISSION_ID} ====="
-        in log_text
+    if case.planner_log_re is not None:
+        assert any(
+            case.planner_log_re.search(m) for m in caplog.messages
+        ), f"Expected planner log pattern not found in output. Pattern: {case.planner_log_re.pattern}\nMessages: {caplog.messages}"
+
+    if audit_passes:
+        outcome_logs = (
+            _LOG_PASSED.format(cid=commission_id),
+            _LOG_COMPLETED.format(cid=commission_id),
+        )
+    else:
+        outcome_logs = (
+            _LOG_FAILED_ATTEMPT.format(cid=commission_id, reason=case.audit.message),
+            _LOG_OUT_OF_ATTEMPTS.format(cid=commission_id),
+        )
+    _assert_logged(
+        caplog.messages,
+        _LOG_START.format(cid=commission_id),
+        _LOG_INVOKE_PLANNER.format(cid=commission_id),
+        _LOG_PLANNER_DONE,
+        _LOG_ATTEMPT,
+        _LOG_CODER_DONE.format(path=mock_code_path, message=_CODER_SUCCESS_MESSAGE),
+        _LOG_SYNTAX_AUDITOR.format(
+            status=_SYNTAX_OK.status, message=_SYNTAX_OK.message
+        ),
+        _LOG_LIVE_AUDITOR.format(status=case.audit.status, message=case.audit.message),
+        *outcome_logs,
     )
-    assert "Workshop Manager: Invoking Planner Agent" in log_text
-    assert "Workshop Manager: Invoking Coder Agent" in log_text
-    assert "Workshop Manager: Invoking Auditor Agent" in log_text
-
-    # We need to import re for this
-    import re
+    if not audit_passes:
+        assert not _logged(caplog.messages, _LOG_COMPLETED.format(cid=commission_id))
 
-    # Use regex for more flexible matching of the truncated planner log
-    # Focusing on the key content due to inconsistencies in exact str representation
-    planner_log_pattern = r"Workshop Manager: Planner Agent returned plan:.*?Create a Python file that prints 'Hello, Wor"
-    assert re.search(
-        planner_log_pattern, log_text
-    ), f"Expected planner log pattern not found in output. Pattern: {planner_log_pattern}\nOutput: {log_text}"
 
-    # Check Coder agent completion log
-    assert (
-        f"Workshop Manager: Coder Agent completed. Code path: {mock_code_output_instance.code_path}, Message: {mock_code_output_instance.message}"
-        in log_text
-    )
-    # Check Auditor agent reporting log
-    assert (
-        f"Workshop Manager: Auditor Agent reported: {mock_audit_output_instance.status} - {mock_audit_output_instance.message}"
-        in log_text
-    )
-    assert (
-        f"===== V1 Workflow for Commission: {TEST_COMMISSION_ID} Completed Successfully ====="
-        in log_text
+def test_run_batch_runs_each_commission_on_its_own_manager_copy(manager, monkeypatch):
+    """
+    run_batch returns one result per commission in input order, reports a
+    failing commission's exception in place, and never runs a commission on
+    the shared manager itself (its strategy counters are per-commission).
+    """
+    runners = []
+
+    def fake_run_v1_commission(self, user_prompt, commission_id):
+        runners.append(self)
+        if user_prompt == OTHER_PROMPT:
+            raise RuntimeError(f"{commission_id} failed")
+        return manager.workshop_root / commission_id
+
+    monkeypatch.setattr(WorkshopManager, "run_v1_commission", fake_run_v1_commission)
+
+    results = asyncio.run(
+        manager.run_batch(
+            [
+                (HELLO_WORLD_PROMPT, "batch_a"),
+                (OTHER_PROMPT, "batch_b"),
+                (HELLO_WORLD_PROMPT, "batch_c"),
+            ],
+            max_parallel=2,
+        )
     )
 
+    assert results[0] == manager.workshop_root / "batch_a"
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]) == "batch_b failed"
+    assert results[2] == manager.workshop_root / "batch_c"
+    assert len(runners) == 3
+    assert all(runner is not manager for runner in runners)
 
-@patch("gandalf_workshop.workshop_manager.initialize_planner_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_coder_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_auditor_agent_v1")
-def test_run_v1_commission_audit_failure(
-    MockInitializeAuditorV1,
-    MockInitializeCoderV1,
-    MockInitializePlannerV1,
-    manager,
-    caplog,  # Changed from capsys
-):
+
+def test_run_batch_audits_in_spawned_processes(manager, monkeypatch):
     """
-    Tests the V1 commission workflow where the auditor reports a failure.
-    All agent calls are mocked.
+    With audit_in_processes=True, run_batch hands its commissions a process
+    pool whose workers are spawned, not forked from the running threads,
+    and shuts it down afterwards.
     """
-    # --- Configure Mocks ---
-    # 1. Planner Mock
-    mock_plan_instance = PlanOutput(tasks=["Some generic task"])
-    MockInitializePlannerV1.return_value = mock_plan_instance
-
-    # 2. Coder Mock
-    commission_work_dir = Path("gandalf_workshop/commission_work") / TEST_COMMISSION_ID
-    # For a generic task, the coder agent creates 'task_output.txt'
-    expected_code_filename = "task_output.txt"
-    mock_code_path = commission_work_dir / expected_code_filename
+    executors = []
 
-    commission_work_dir.mkdir(parents=True, exist_ok=True)
-    # Create a dummy file that the Coder agent would have created
-    with open(mock_code_path, "w") as f:
-        f.write("Content for generic task.\n")
+    def fake_run_v1_commission_async(
+        self, user_prompt, commission_id, audit_executor=None
+    ):
+        executors.append(audit_executor)
+        return asyncio.sleep(0, result=manager.workshop_root / commission_id)
 
-    mock_code_output_instance = CodeOutput(
-        code_path=mock_code_path, message="Mock Coder: Generic content generated."
+    monkeypatch.setattr(
+        WorkshopManager, "run_v1_commission_async", fake_run_v1_commission_async
     )
-    MockInitializeCoderV1.return_value = mock_code_output_instance
+    pool_class = Mock()
+    monkeypatch.setattr(workshop_manager, "ProcessPoolExecutor", pool_class)
 
-    # 3. Auditor Mock (configured to fail)
-    mock_audit_failure_message = "Mock Auditor: Critical security flaw detected!"
-    mock_audit_output_instance = AuditOutput(
-        status=AuditStatus.FAILURE, message=mock_audit_failure_message
+    asyncio.run(
+        manager.run_batch(
+            [(HELLO_WORLD_PROMPT, "spawn_a"), (OTHER_PROMPT, "spawn_b")],
+            audit_in_processes=True,
+        )
     )
-    MockInitializeAuditorV1.return_value = mock_audit_output_instance
 
-    MockInitializeAuditorV1.return_value = mock_audit_output_instance
+    pool_class.assert_called_once()
+    assert pool_class.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    assert executors == [pool_class.return_value] * 2
+    pool_class.return_value.shutdown.assert_called_once()
 
-    # --- Run the Commission ---
-    caplog.set_level(
-        logging.INFO, logger="gandalf_workshop.workshop_manager"
-    )  # Set log level
-    with pytest.raises(Exception) as excinfo:
-        manager.run_v1_commission(OTHER_PROMPT, TEST_COMMISSION_ID)
 
-    # --- Assertions ---
-    # 1. Planner was called
-    MockInitializePlannerV1.assert_called_once_with(OTHER_PROMPT, TEST_COMMISSION_ID)
-
-    # 2. Coder was called
-    MockInitializeCoderV1.assert_called_once_with(
-        plan_input=mock_plan_instance,
-        commission_id=TEST_COMMISSION_ID,
-        output_target_dir=commission_work_dir,
+def test_exhausted_attempts_raise_audit_failure_with_last_audit(
+    manager, commission_id, tmp_path, monkeypatch
+):
+    """
+    When every attempt fails its syntax audit, run_v1_commission raises
+    AuditFailure carrying the failing AuditOutput, not a bare Exception.
+    """
+    code_path = tmp_path / _CODER_FILENAME
+    code_path.write_text(AUDIT_FAILURE_CASE.code_content)
+    monkeypatch.setattr(manager, "llm_config", {"provider_name": "mock_provider"})
+    monkeypatch.setattr(manager, "MAX_TOTAL_ATTEMPTS", 1)
+    monkeypatch.setattr(
+        workshop_manager,
+        "initialize_live_planner_agent",
+        Mock(return_value=AUDIT_FAILURE_CASE.plan),
     )
-    # File should still be created by our mock setup before audit fails
-    assert mock_code_path.exists()
-
-    # 3. Auditor was called
-    MockInitializeAuditorV1.assert_called_once_with(
-        code_input=mock_code_output_instance, commission_id=TEST_COMMISSION_ID
+    monkeypatch.setattr(
+        workshop_manager,
+        "initialize_live_coder_agent",
+        Mock(return_value=CodeOutput(code_path=code_path, message="mock")),
     )
-
-    # 4. Exception message check
-    assert (
-        f"Audit failed for commission '{TEST_COMMISSION_ID}': {mock_audit_failure_message}"
-        in str(excinfo.value)
+    monkeypatch.setattr(
+        workshop_manager,
+        "initialize_auditor_agent_v1",
+        Mock(return_value=AUDIT_FAILURE_CASE.audit),
     )
 
-    # 5. Check logs
-    log_text = caplog.text
-    assert (
-        f"Workshop Manager: Commission '{TEST_COMMISSION_ID}' failed audit. Reason: {mock_audit_failure_message}"
-        in log_text
-    )
-    # Check Coder agent completion log
-    assert (
-        f"Workshop Manager: Coder Agent completed. Code path: {mock_code_output_instance.code_path}, Message: {mock_code_output_instance.message}"
-        in log_text
+    with pytest.raises(AuditFailure) as excinfo:
+        manager.run_v1_commission(AUDIT_FAILURE_CASE.prompt, commission_id)
+
+    assert excinfo.value.commission_id == commission_id
+    assert excinfo.value.audit_output is AUDIT_FAILURE_CASE.audit
+    assert excinfo.value.last_failure_message == AUDIT_FAILURE_CASE.audit.message
+    assert str(excinfo.value) == f"Max total attempts reached for '{commission_id}'."
+
+
+def test_unreadable_code_file_fails_the_attempt(
+    manager, commission_id, tmp_path, monkeypatch
+):
+    """
+    A Coder file that cannot be decoded fails that attempt (and, with one
+    attempt, the commission) instead of escaping run_v1_commission, and
+    neither auditor is called.
+    """
+    code_path = tmp_path / "generated_code.py"
+    code_path.write_bytes(b"\xff\xfe not utf-8")
+    monkeypatch.setattr(manager, "llm_config", {"provider_name": "mock_provider"})
+    monkeypatch.setattr(manager, "MAX_TOTAL_ATTEMPTS", 1)
+    auditor = Mock()
+    live_auditor = Mock()
+    monkeypatch.setattr(
+        workshop_manager,
+        "initialize_live_planner_agent",
+        Mock(return_value=_HELLO_WORLD_PLAN),
     )
-    # Check Auditor agent reporting log - it should show failure
-    assert (
-        f"Workshop Manager: Auditor Agent reported: {mock_audit_output_instance.status} - {mock_audit_output_instance.message}"
-        in log_text
+    monkeypatch.setattr(
+        workshop_manager,
+        "initialize_live_coder_agent",
+        Mock(return_value=CodeOutput(code_path=code_path, message="mock")),
     )
-    assert (
-        f"===== V1 Workflow for Commission: {TEST_COMMISSION_ID} Completed Successfully ====="
-        not in log_text
+    monkeypatch.setattr(workshop_manager, "initialize_auditor_agent_v1", auditor)
+    monkeypatch.setattr(workshop_manager, "initialize_live_auditor_agent", live_auditor)
+
+    with pytest.raises(AuditFailure) as excinfo:
+        manager.run_v1_commission(HELLO_WORLD_PROMPT, commission_id)
+
+    assert excinfo.value.last_failure_message.startswith(
+        "Error during audit file read:"
     )
+    auditor.assert_not_called()
+    live_auditor.assert_not_called()
 
 
-@patch("gandalf_workshop.workshop_manager.initialize_planner_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_coder_agent_v1")
-@patch("gandalf_workshop.workshop_manager.initialize_auditor_agent_v1")
-def test_run_v1_commission_other_prompt_success_mocked_agents(
-    MockInitializeAuditorV1,
-    MockInitializeCoderV1,
-    MockInitializePlannerV1,
-    manager,
-    caplog,  # Changed from capsys
+@pytest.mark.parametrize("file_lock", [True, False], ids=["flock", "no_fcntl"])
+def test_commission_cache_reuses_a_finished_commission(
+    manager, commission_id, tmp_path, monkeypatch, file_lock
 ):
     """
-    Tests V1 commission with a non-"hello world" prompt, with all agent calls mocked
-    to ensure the WorkshopManager logic flows correctly.
+    With a commission cache configured, a finished commission is recorded
+    and a repeat of it returns the recorded path without running any agent,
+    as long as that file still exists. Where fcntl is unavailable the cache
+    still works, locked only within the process.
+    """
+    if file_lock:
+        pytest.importorskip("fcntl")
+    else:
+        monkeypatch.setattr(workshop_manager, "fcntl", None)
+    monkeypatch.setattr(manager, "commission_cache_path", tmp_path / "commissions")
+    planner = Mock(side_effect=AssertionError("planner should not run"))
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    code_path = tmp_path / _CODER_FILENAME
+    code_path.write_text(HELLO_WORLD_CASE.code_content)
+
+    assert manager._load_cached_commission(HELLO_WORLD_PROMPT, commission_id) is None
+    manager._store_cached_commission(HELLO_WORLD_PROMPT, commission_id, code_path)
+
+    assert manager.run_v1_commission(HELLO_WORLD_PROMPT, commission_id) == code_path
+    # A different prompt under the same ID is a different commission.
+    assert manager._load_cached_commission(OTHER_PROMPT, commission_id) is None
+    code_path.unlink()
+    assert manager._load_cached_commission(HELLO_WORLD_PROMPT, commission_id) is None
+
+
+def test_commission_cache_lookups_wait_for_a_writer_lock(
+    manager, commission_id, tmp_path, monkeypatch
+):
     """
-    commission_id = "v1_other_prompt_commission"  # Use a unique ID for this test
+    The commission cache is guarded by a file lock, so a lookup waits while
+    another holder (e.g. a writer in another process) has it exclusively.
+    """
+    fcntl = pytest.importorskip("fcntl")
+    cache_path = tmp_path / "commissions"
+    monkeypatch.setattr(manager, "commission_cache_path", cache_path)
+    code_path = tmp_path / _CODER_FILENAME
+    code_path.write_text(HELLO_WORLD_CASE.code_content)
+    manager._store_cached_commission(HELLO_WORLD_PROMPT, commission_id, code_path)
+
+    with open(tmp_path / "commissions.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            lookup = pool.submit(
+                manager._load_cached_commission, HELLO_WORLD_PROMPT, commission_id
+            )
+            with pytest.raises(FuturesTimeoutError):
+                lookup.result(timeout=0.2)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            assert lookup.result(timeout=5) == code_path
+
+
+def test_launch_commission_returns_at_once_and_collect_waits(manager, monkeypatch):
+    """
+    launch_commission hands back the commission ID without waiting; the
+    on_complete callback fires when the commission finishes, and collect
+    returns its result (or re-raises its failure).
+    """
+    release = asyncio.Event()
 
-    # --- Configure Mocks ---
-    # 1. Planner Mock for a generic prompt
-    generic_task_description = f"Task based on: {OTHER_PROMPT}"
-    mock_plan_instance = PlanOutput(tasks=[generic_task_description])
-    MockInitializePlannerV1.return_value = mock_plan_instance
-
-    # 2. Coder Mock for a generic task
-    commission_work_dir = Path("gandalf_workshop/commission_work") / commission_id
-    # Actual coder creates 'task_output.txt' for generic plans
-    expected_code_filename = "task_output.txt"
-    mock_code_path = commission_work_dir / expected_code_filename
-
-    commission_work_dir.mkdir(parents=True, exist_ok=True)
-    # Create a dummy file that the Coder agent would have created
-    with open(mock_code_path, "w") as f:
-        f.write(
-            f"Content for: {OTHER_PROMPT}\nBased on plan: {[generic_task_description]}"
-        )
+    async def fake_run_v1_commission_async(self, user_prompt, commission_id):
+        await release.wait()
+        if user_prompt == OTHER_PROMPT:
+            raise RuntimeError(f"{commission_id} failed")
+        return manager.workshop_root / commission_id
 
-    mock_code_output_instance = CodeOutput(
-        code_path=mock_code_path,
-        message=f"Mock Coder: Generated content for {OTHER_PROMPT}.",
+    monkeypatch.setattr(
+        WorkshopManager, "run_v1_commission_async", fake_run_v1_commission_async
     )
-    MockInitializeCoderV1.return_value = mock_code_output_instance
+    monkeypatch.setattr(manager, "_jobs", {})
+    finished = []
 
-    # 3. Auditor Mock (successful audit)
-    mock_audit_output_instance = AuditOutput(
-        status=AuditStatus.SUCCESS,
-        message="Mock Auditor: Audit passed for generic content.",
-    )
-    MockInitializeAuditorV1.return_value = mock_audit_output_instance
+    async def scenario():
+        ok_id = manager.launch_commission(
+            HELLO_WORLD_PROMPT, "launch_a", on_complete=finished.append
+        )
+        failing_id = manager.launch_commission(OTHER_PROMPT, "launch_b")
+        assert (ok_id, failing_id) == ("launch_a", "launch_b")
+        with pytest.raises(ValueError):
+            manager.launch_commission(HELLO_WORLD_PROMPT, "launch_a")
+        assert not finished
 
-    MockInitializeAuditorV1.return_value = mock_audit_output_instance
+        release.set()
+        assert await manager.collect(ok_id) == manager.workshop_root / "launch_a"
+        with pytest.raises(RuntimeError, match="launch_b failed"):
+            await manager.collect(failing_id)
 
-    # --- Run the Commission ---
-    # Need to use the specific commission_id for this test
-    caplog.set_level(
-        logging.INFO, logger="gandalf_workshop.workshop_manager"
-    )  # Set log level
-    result_path = manager.run_v1_commission(OTHER_PROMPT, commission_id)
+    asyncio.run(scenario())
+    assert len(finished) == 1 and finished[0].done()
+    assert manager._jobs == {}
 
-    # --- Assertions ---
-    # 1. Planner was called
-    MockInitializePlannerV1.assert_called_once_with(OTHER_PROMPT, commission_id)
 
-    # 2. Coder was called
-    MockInitializeCoderV1.assert_called_once_with(
-        plan_input=mock_plan_instance,
-        commission_id=commission_id,
-        output_target_dir=commission_work_dir,
-    )
-    assert result_path == mock_code_path
-    assert mock_code_path.exists()
-    with open(mock_code_path, "r") as f:
-        content = f.read()
-        assert f"Content for: {OTHER_PROMPT}" in content
-        assert generic_task_description in content
-
-    # 3. Auditor was called
-    MockInitializeAuditorV1.assert_called_once_with(
-        code_input=mock_code_output_instance, commission_id=commission_id
-    )
+def test_initial_plan_and_syntax_audit_are_memoized(manager, tmp_path, monkeypatch):
+    """
+    A repeated prompt reuses the first plan, and re-auditing identical code
+    reuses the first syntax audit; different code is audited afresh.
+    """
+    planner = Mock(return_value=_HELLO_WORLD_PLAN)
+    auditor = Mock(return_value=HELLO_WORLD_CASE.audit)
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    monkeypatch.setattr(workshop_manager, "initialize_auditor_agent_v1", auditor)
+    llm_config = {"provider_name": "mock_provider"}
+
+    first = manager._initial_plan(HELLO_WORLD_PROMPT, "memo_a", llm_config)
+    second = manager._initial_plan(HELLO_WORLD_PROMPT, "memo_b", llm_config)
+    assert first is second is _HELLO_WORLD_PLAN
+    planner.assert_called_once_with(HELLO_WORLD_PROMPT, "memo_a", llm_config=llm_config)
+
+    code_path = tmp_path / "main.py"
+    code_path.write_text(HELLO_WORLD_CASE.code_content)
+    code_output = CodeOutput(code_path=code_path, message="mock")
+    manager._syntax_audit(code_output, *_source(code_path), "memo_a")
+    manager._syntax_audit(code_output, *_source(code_path), "memo_b")
+    assert auditor.call_count == 1
+
+    code_path.write_text(OTHER_PROMPT_CASE.code_content)
+    manager._syntax_audit(code_output, *_source(code_path), "memo_c")
+    assert auditor.call_count == 2
+
+
+def test_concurrent_commissions_share_one_planner_call(manager, monkeypatch):
+    """
+    Commissions that plan the same prompt at the same time (as in one
+    run_batch) wait on the first planner call instead of each making one.
+    """
+    monkeypatch.setattr(manager, "_plans_in_flight", {})
+    planner_started = threading.Event()
+    release_planner = threading.Event()
+
+    def slow_planner(user_prompt, commission_id, llm_config):
+        planner_started.set()
+        release_planner.wait(timeout=5)
+        return _HELLO_WORLD_PLAN
+
+    planner = Mock(side_effect=slow_planner)
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    llm_config = {"provider_name": "mock_provider"}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        first = pool.submit(
+            manager._initial_plan, HELLO_WORLD_PROMPT, "flight_a", llm_config
+        )
+        assert planner_started.wait(timeout=5)
+        others = [
+            pool.submit(manager._initial_plan, HELLO_WORLD_PROMPT, cid, llm_config)
+            for cid in ("flight_b", "flight_c")
+        ]
+        release_planner.set()
+        plans = [f.result(timeout=5) for f in [first, *others]]
 
-    # 4. Check logs for successful completion
-    log_text = caplog.text
-    assert (
-        f"===== Starting V1 Workflow for Commission: {commission_id} =====" in log_text
-    )
-    assert (
-        f"Workshop Manager: Coder Agent completed. Code path: {mock_code_path}"  # Check part of message
-        in log_text
-    )
+    assert plans == [_HELLO_WORLD_PLAN] * 3
+    planner.assert_called_once()
+    assert manager._plans_in_flight == {}
+
+
+def test_failed_plan_is_not_reused(manager, monkeypatch):
+    """
+    An error plan from the live planner (e.g. a transient provider failure)
+    is returned but not cached, so the next commission for the prompt asks
+    the planner again.
+    """
+    monkeypatch.setattr(manager, "_plans_in_flight", {})
+    error_plan = PlanOutput(tasks=["Error during planning: RateLimitError - 429"])
+    planner = Mock(side_effect=[error_plan, _HELLO_WORLD_PLAN])
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    llm_config = {"provider_name": "mock_provider"}
+
+    assert manager._initial_plan(HELLO_WORLD_PROMPT, "err_a", llm_config) is error_plan
     assert (
-        f"Workshop Manager: Auditor Agent reported: {AuditStatus.SUCCESS} - Mock Auditor: Audit passed for generic content."
-        in log_text
+        manager._initial_plan(HELLO_WORLD_PROMPT, "err_b", llm_config)
+        is _HELLO_WORLD_PLAN
     )
-    assert (
-        f"===== V1 Workflow for Commission: {commission_id} Completed Successfully ====="
-        in log_text
+    assert planner.call_count == 2
+    assert manager._plans_in_flight == {}
+
+
+def test_commissions_waiting_on_a_failed_plan_plan_again(manager, monkeypatch):
+    """
+    A commission waiting on a planner call that returns an error plan does
+    not take that plan; it makes its own planner call.
+    """
+    waiting = threading.Event()
+
+    class _InFlight(dict):
+        # Signals once a commission has found another's planner call.
+        def get(self, key, default=None):
+            pending = super().get(key, default)
+            if pending is not None:
+                waiting.set()
+            return pending
+
+    monkeypatch.setattr(manager, "_plans_in_flight", _InFlight())
+    planner_started = threading.Event()
+    error_plan = PlanOutput(tasks=["Error: LLM returned empty plan."])
+
+    def planner_failing_first(user_prompt, commission_id, llm_config):
+        if commission_id == "retry_a":
+            planner_started.set()
+            waiting.wait(timeout=5)
+            return error_plan
+        return _HELLO_WORLD_PLAN
+
+    planner = Mock(side_effect=planner_failing_first)
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    llm_config = {"provider_name": "mock_provider"}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(
+            manager._initial_plan, HELLO_WORLD_PROMPT, "retry_a", llm_config
+        )
+        assert planner_started.wait(timeout=5)
+        waiter = pool.submit(
+            manager._initial_plan, HELLO_WORLD_PROMPT, "retry_b", llm_config
+        )
+        assert first.result(timeout=5) is error_plan
+        assert waiter.result(timeout=5) is _HELLO_WORLD_PLAN
+
+    assert waiting.is_set()
+    assert [c.args[1] for c in planner.call_args_list] == ["retry_a", "retry_b"]
+    assert manager._plans_in_flight == {}
+
+
+def test_plan_cache_evicts_least_recently_used_plan(manager, monkeypatch):
+    """
+    Past PLAN_CACHE_MAX_ENTRIES, the plan used longest ago is dropped and
+    planned afresh on its next use; recently reused plans are kept.
+    """
+    monkeypatch.setattr(workshop_manager, "PLAN_CACHE_MAX_ENTRIES", 2)
+    planner = Mock(return_value=_GENERIC_PLAN)
+    monkeypatch.setattr(workshop_manager, "initialize_live_planner_agent", planner)
+    llm_config = {"provider_name": "mock_provider"}
+
+    for prompt in ["a", "b", "a", "c", "a", "b"]:
+        manager._initial_plan(prompt, "lru", llm_config)
+
+    # "a" stays cached throughout; "b" was evicted by "c" and re-planned.
+    assert [c.args[0] for c in planner.call_args_list] == ["a", "b", "c", "b"]
+
+
+def test_audit_caches_evict_least_recently_used_audit(manager, tmp_path, monkeypatch):
+    """
+    Past AUDIT_CACHE_MAX_ENTRIES, the syntax and live audit caches each drop
+    the audit used longest ago, as the plan cache does.
+    """
+    monkeypatch.setattr(workshop_manager, "AUDIT_CACHE_MAX_ENTRIES", 2)
+    auditor = Mock(return_value=_SYNTAX_OK)
+    live_auditor = Mock(return_value=HELLO_WORLD_CASE.audit)
+    monkeypatch.setattr(workshop_manager, "initialize_auditor_agent_v1", auditor)
+    monkeypatch.setattr(workshop_manager, "initialize_live_auditor_agent", live_auditor)
+    code_output = CodeOutput(code_path=tmp_path / _CODER_FILENAME, message="mock")
+    llm_config = {"provider_name": "mock_provider"}
+
+    for source in ["a", "b", "a", "c", "a", "b"]:
+        manager._syntax_audit(code_output, source, source, "lru")
+        manager._live_audit(source, source, _HELLO_WORLD_PLAN, "lru", llm_config)
+
+    # "a" stays cached throughout; "b" was evicted by "c" and audited again.
+    expected = ["a", "b", "c", "b"]
+    assert [c.kwargs["source_code"] for c in auditor.call_args_list] == expected
+    assert [c.kwargs["generated_code"] for c in live_auditor.call_args_list] == (
+        expected
     )
 
-    # Cleanup for this specific test's directory if not covered by global fixture
-    # The global fixture `cleanup_commission_work_dir` uses TEST_COMMISSION_ID and "v1_commission"
-    # This test uses "v1_other_prompt_commission", so it needs its own cleanup.
-    # This is better handled by parameterizing the cleanup fixture or ensuring unique IDs are always cleaned.
-    # For now, explicit cleanup:
-    if commission_work_dir.exists():
-        shutil.rmtree(commission_work_dir)
+
+def test_only_passing_live_audits_are_reused(manager, tmp_path, monkeypatch):
+    """
+    A live audit that passed is reused for the same code and plan; a failed
+    one is not, since it may have been a transient provider error.
+    """
+    auditor = Mock(side_effect=[AUDIT_FAILURE_CASE.audit, HELLO_WORLD_CASE.audit])
+    monkeypatch.setattr(workshop_manager, "initialize_live_auditor_agent", auditor)
+    source = HELLO_WORLD_CASE.code_content
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    llm_config = {"provider_name": "mock_provider"}
+
+    results = [
+        manager._live_audit(source, digest, _HELLO_WORLD_PLAN, "live", llm_config)
+        for _ in range(3)
+    ]
+
+    assert results == [
+        AUDIT_FAILURE_CASE.audit,
+        HELLO_WORLD_CASE.audit,
+        HELLO_WORLD_CASE.audit,
+    ]
+    assert auditor.call_count == 2
+    assert auditor.call_args.kwargs["generated_code"] == HELLO_WORLD_CASE.code_content
+
+
+def test_syntax_audit_is_submitted_to_the_audit_executor(
+    manager, tmp_path, monkeypatch
+):
+    """
+    With an audit executor set (as run_batch does for audit_in_processes),
+    the syntax auditor runs on the executor rather than the calling thread.
+    """
+    auditor = Mock(return_value=HELLO_WORLD_CASE.audit)
+    monkeypatch.setattr(workshop_manager, "initialize_auditor_agent_v1", auditor)
+    code_path = tmp_path / "main.py"
+    code_path.write_text(HELLO_WORLD_CASE.code_content)
+    code_output = CodeOutput(code_path=code_path, message="mock")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        executor = Mock(wraps=pool)
+        monkeypatch.setattr(manager, "_audit_executor", executor)
+        result = manager._syntax_audit(code_output, *_source(code_path), "pool")
+
+    assert result is HELLO_WORLD_CASE.audit
+    executor.submit.assert_called_once_with(
+        auditor,
+        code_input=code_output,
+        commission_id="pool",
+        source_code=HELLO_WORLD_CASE.code_content,
+    )
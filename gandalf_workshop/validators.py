@@ -1,11 +1,105 @@
 import ast
+import functools
+import importlib.util
+import logging
+import os
 import re
+import subprocess
+import sys
+import threading
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Any, Dict, Tuple, List, Optional
 from radon.visitors import ComplexityVisitor
 from radon.metrics import h_visit_ast  # Halstead metrics, could be useful later
 from radon.raw import analyze as analyze_raw  # Raw metrics like SLOC, LLOC
 
+# AST node types counted as significant statements by check_non_trivial.
+_STATEMENT_TYPES = (
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.With,
+    ast.AsyncWith,
+    ast.Try,
+    ast.Assign,
+    ast.Expr,
+    ast.Return,
+    ast.Raise,
+    ast.Assert,
+)
+# The only nodes statements can appear under: statement bodies, except
+# handlers and match cases. Expressions never contain statements.
+# ast.match_case only exists on Python 3.10+.
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, "match_case") else ()
+)
+
+# `python -m flake8` under the interpreter running the workshop, so the flake8
+# installed alongside it is used without looking python up on PATH.
+_FLAKE8_COMMAND = (sys.executable, "-m", "flake8")
+# Tab-separated so a batch's output can be split back up by file path.
+_FLAKE8_FORMAT = "%(path)s\t%(row)d\t%(col)d\t%(code)s\t%(text)s"
+
+logger = logging.getLogger(__name__)
+
+# In-process flake8 style guides, keyed on the working directory they were
+# built in: flake8 finds its config (.flake8, setup.cfg, tox.ini) from the
+# cwd, as the subprocess would, so a guide is only reused from the same
+# directory. Each is built on first use there (the flake8 import, plugin
+# discovery and config parsing happen once) and shared by later calls.
+# flake8 is not imported with this module: workshop_manager imports it, and
+# loading flake8's application costs tens of milliseconds that only callers
+# who actually lint should pay. flake8's Application is not thread-safe, so
+# runs are serialised with _FLAKE8_LOCK.
+_flake8_style_guides: Dict[str, Any] = {}
+_FLAKE8_LOCK = threading.Lock()
+# Where _CollectingFormatter puts the errors reported for the current run.
+_flake8_collected = threading.local()
+
+
+class _EnoughStatements(Exception):
+    """Raised by _StatementCounter once it has seen enough statements."""
+
+
+class _StatementCounter(ast.NodeVisitor):
+    """
+    Counts _STATEMENT_TYPES nodes, stopping the traversal as soon as `limit`
+    is reached: check_non_trivial only needs to know the threshold was met,
+    so there is no reason to visit the rest of a large tree.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+
+    def _count_statement(self, node: ast.AST) -> None:
+        self.count += 1
+        if self.count >= self.limit:
+            raise _EnoughStatements
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Descend through statement lists only, skipping expression subtrees
+        # (decorators, call arguments, literals...), which hold no statements.
+        for _, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, _STATEMENT_CONTAINERS):
+                        self.visit(item)
+
+
+for _node_type in _STATEMENT_TYPES:
+    setattr(
+        _StatementCounter,
+        f"visit_{_node_type.__name__}",
+        _StatementCounter._count_statement,
+    )
+del _node_type
+
 
 class CodeStructureValidator:
     MIN_NON_EMPTY_LINES = 10  # Heuristic for non-trivial code
@@ -14,20 +108,22 @@ class CodeStructureValidator:
     MAX_FUNCTION_COMPLEXITY = (
         15  # Max cyclomatic complexity for any single function/method
     )
+    # Finds 'if __name__ == "__main__":', allowing for variations in spacing
+    # and quotes. Compiled once for every validator instance.
+    _ENTRY_POINT_RE = re.compile(
+        r"""if\s+__name__\s*==\s*(?:"__main__"|'__main__')\s*:"""
+    )
+    # Matches the start of each line that is neither blank nor a comment.
+    _CODE_LINE_RE = re.compile(r"^[^\S\n]*[^\s#]", re.MULTILINE)
 
     def __init__(self, code_content: str, filepath: Optional[Path] = None):
         self.code_content = code_content
-        self.tree = None
-        try:
-            self.tree = ast.parse(self.code_content)
-        except SyntaxError as e:
-            self.tree = (
-                None  # Will be handled by check_non_trivial or other AST-based checks
-            )
-            # self.errors.append(f"Initial AST parsing failed: {e}") # Already handled by syntax audit
-            pass  # Syntax errors should be caught by the syntax auditor first.
+        # Parsed lazily by the `tree` property: inputs that already fail the
+        # cheap line-count check never pay for ast.parse.
+        self._tree: Optional[ast.AST] = None
+        self._parsed = False
+        self.parse_error: Optional[SyntaxError] = None
         self.filepath = filepath  # Optional, mainly for context in messages
-        self.lines = [line for line in code_content.splitlines()]
         self.errors: List[str] = []
         self.is_script_intent = (
             True  # Default assumption, can be refined if more context is passed
@@ -42,59 +138,49 @@ class CodeStructureValidator:
             # Could potentially set self.is_script_intent = False if it's clearly a library module
             pass
 
-    def _is_comment_or_empty(self, line: str) -> bool:
-        stripped_line = line.strip()
-        return not stripped_line or stripped_line.startswith("#")
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """The parsed module, or None if code_content has a syntax error."""
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._tree = ast.parse(self.code_content)
+            except SyntaxError as e:
+                # Syntax errors should be caught by the syntax auditor first;
+                # keep the error so check_non_trivial can report it.
+                self.parse_error = e
+        return self._tree
 
     def check_non_trivial(self) -> bool:
-        non_empty_lines = [
-            line for line in self.lines if not self._is_comment_or_empty(line)
-        ]
-        if len(non_empty_lines) < self.MIN_NON_EMPTY_LINES:
+        # Count code lines with one regex scan rather than splitting the
+        # source into a list and stripping every line.
+        non_empty_count = len(self._CODE_LINE_RE.findall(self.code_content))
+        if non_empty_count < self.MIN_NON_EMPTY_LINES:
             self.errors.append(
                 f"Code seems too trivial: less than {self.MIN_NON_EMPTY_LINES} non-empty/non-comment lines "
-                f"(found {len(non_empty_lines)})."
+                f"(found {non_empty_count})."
+            )
+            return False
+
+        # Check for some minimal number of statements using the AST
+        if self.tree is None:
+            # This shouldn't happen if syntax audit already passed, but as a safeguard
+            self.errors.append(
+                f"Syntax error during non-trivial check (AST parsing): {self.parse_error}"
             )
             return False
 
-        # Check for some minimal number of statements using AST
+        counter = _StatementCounter(self.MIN_STATEMENTS)
         try:
-            tree = ast.parse(self.code_content)
-            statement_count = 0
-            for node in ast.walk(tree):
-                if isinstance(
-                    node,
-                    (
-                        ast.FunctionDef,
-                        ast.AsyncFunctionDef,
-                        ast.ClassDef,
-                        ast.If,
-                        ast.For,
-                        ast.AsyncFor,
-                        ast.While,
-                        ast.With,
-                        ast.AsyncWith,
-                        ast.Try,
-                        ast.Assign,
-                        ast.Expr,
-                        ast.Return,
-                        ast.Raise,
-                        ast.Assert,
-                    ),
-                ):
-                    statement_count += 1
-
-            if statement_count < self.MIN_STATEMENTS:
-                self.errors.append(
-                    f"Code seems too trivial: less than {self.MIN_STATEMENTS} significant AST statements "
-                    f"(found {statement_count})."
-                )
-                return False
+            counter.visit(self.tree)
+        except _EnoughStatements:
+            return True
+        statement_count = counter.count
 
-        except SyntaxError as e:
-            # This shouldn't happen if syntax audit already passed, but as a safeguard
+        if statement_count < self.MIN_STATEMENTS:
             self.errors.append(
-                f"Syntax error during non-trivial check (AST parsing): {e}"
+                f"Code seems too trivial: less than {self.MIN_STATEMENTS} significant AST statements "
+                f"(found {statement_count})."
             )
             return False
         return True
@@ -105,26 +191,8 @@ class CodeStructureValidator:
         ):  # If determined not to be a script, skip this check
             return True
 
-        # Regex to find 'if __name__ == "__main__":'
-        # Accounts for variations in spacing and quotes.
-        entry_point_pattern = re.compile(
-            r"""
-            if\s+__name__\s*==\s*                      # if __name__ ==
-            (?:
-                "__main__"                             # "__main__"
-                |
-                '__main__'                             # '__main__'
-            )
-            \s*:                                       # :
-        """,
-            re.VERBOSE,
-        )
-
-        found_entry_point = False
-        for line in self.lines:
-            if entry_point_pattern.search(line):
-                found_entry_point = True
-                break
+        # One scan over the whole source instead of a search per line.
+        found_entry_point = self._ENTRY_POINT_RE.search(self.code_content) is not None
 
         if not found_entry_point:
             self.errors.append(
@@ -166,103 +234,175 @@ def run_flake8_validation(filepath: Path) -> Tuple[bool, List[str]]:
     """
     Runs flake8 on the given file and returns success/failure and errors.
     """
-    import subprocess
-    import logging  # Add logging for this function
+    return run_flake8_validation_batch([filepath])[filepath]
+
+
+def run_flake8_validation_batch(
+    filepaths: List[Path],
+) -> Dict[Path, Tuple[bool, List[str]]]:
+    """
+    Runs flake8 once over all the given files. flake8 runs in-process when it
+    is importable, otherwise as a single subprocess for the whole batch.
+    Returns:
+        Dict[Path, Tuple[bool, List[str]]]: (success, errors) for each path,
+        with errors in flake8's usual 'path:row:col: code text' form.
+    """
+    results: Dict[Path, Tuple[bool, List[str]]] = {}
+    to_check: Dict[str, Path] = {}
+    for filepath in filepaths:
+        if not filepath.exists() or not filepath.is_file():
+            results[filepath] = (
+                False,
+                [f"File not found for flake8 validation: {filepath}"],
+            )
+        else:
+            to_check[str(filepath)] = filepath
+    if not to_check:
+        return results
+
+    if _flake8_importable():
+        results.update(_run_flake8_in_process(to_check))
+    else:
+        results.update(_run_flake8_subprocess(to_check))
+    return results
+
+
+@functools.lru_cache(maxsize=None)
+def _flake8_importable() -> bool:
+    """Whether flake8 can run in-process, checked without importing it."""
+    return importlib.util.find_spec("flake8") is not None
 
-    logger = logging.getLogger(__name__)
 
-    if not filepath.exists() or not filepath.is_file():
-        return False, [f"File not found for flake8 validation: {filepath}"]
+def _get_flake8_style_guide():
+    cwd = os.getcwd()
+    style_guide = _flake8_style_guides.get(cwd)
+    if style_guide is None:
+        from flake8.api import legacy as flake8_legacy
+        from flake8.formatting.base import BaseFormatter
+
+        class _CollectingFormatter(BaseFormatter):
+            """Records flake8 errors for the calling thread instead of printing them."""
+
+            def format(self, error):
+                return _format_flake8_error(error)
+
+            def handle(self, error):
+                _flake8_collected.errors.append(error)
+
+        style_guide = flake8_legacy.get_style_guide()
+        style_guide.init_report(_CollectingFormatter)
+        _flake8_style_guides[cwd] = style_guide
+    return style_guide
+
+
+def _format_flake8_error(error) -> str:
+    """Renders a flake8 Violation in flake8's default output format."""
+    return (
+        f"{error.filename}:{error.line_number}:{error.column_number}: "
+        f"{error.code} {error.text}"
+    )
+
 
+def _run_flake8_in_process(
+    to_check: Dict[str, Path],
+) -> Dict[Path, Tuple[bool, List[str]]]:
+    errors_by_path: Dict[Path, List[str]] = {fp: [] for fp in to_check.values()}
+    _flake8_collected.errors = []
     try:
-        # Using the .venv python's flake8 module ensures it's the one from our environment
-        # This is more robust than relying on a globally available flake8
-        # Adjust path to python executable if .venv is not always in root or named differently
-        # For sandbox, assume .venv/bin/python is correct relative to execution dir
-        # If WorkshopManager runs from repo root, this should be fine.
-        # A more robust way might be sys.executable if this validator is always run in same venv
-        # as WorkshopManager. For now, assume .venv is accessible.
-
-        # Path to flake8 within the virtual environment
-        # This assumes the script running this (e.g. WorkshopManager) is in the project root
-        # and .venv is also in the project root.
-        # If this code is part of a library used elsewhere, this path might need to be more dynamic.
-        # For now, let's assume direct execution context.
-
-        # To make it more portable, we can try to find flake8 in PATH first,
-        # or use `python -m flake8`. Let's use `python -m flake8`.
-        # This requires flake8 to be installed in the python environment being used.
-
-        # Determine the python executable from the current environment
-        python_executable = Path(
-            subprocess.check_output(["which", "python"], text=True).strip()
+        with _FLAKE8_LOCK:
+            style_guide = _get_flake8_style_guide()
+            logger.info(f"Running flake8 in-process on: {', '.join(to_check)}")
+            style_guide.check_files(list(to_check))
+    except Exception as e:
+        logger.error(
+            f"An unexpected error occurred during flake8 validation: {e}", exc_info=True
         )
-        # If running in .venv, this should point to .venv/bin/python
-        # More robust: use sys.executable if this module is guaranteed to run in the target venv
-        # For now, this is a common approach.
-        # python_executable = ".venv/bin/python" # Less robust if .venv is not in CWD
-
-        flake8_command = [
-            str(python_executable),  # Use the determined python executable
-            "-m",
-            "flake8",
-            str(filepath),
-        ]
+        failure = (False, [f"Unexpected error during flake8: {str(e)}"])
+        return {filepath: failure for filepath in to_check.values()}
+
+    for error in _flake8_collected.errors:
+        line = _format_flake8_error(error)
+        filepath = to_check.get(error.filename)
+        if filepath is None:
+            # Not attributable to one file: report it against all of them.
+            for errors in errors_by_path.values():
+                errors.append(line)
+        else:
+            errors_by_path[filepath].append(line)
+    _flake8_collected.errors = []
+
+    return {
+        filepath: (not errors, errors) for filepath, errors in errors_by_path.items()
+    }
+
+
+def _run_flake8_subprocess(
+    to_check: Dict[str, Path],
+) -> Dict[Path, Tuple[bool, List[str]]]:
+    results: Dict[Path, Tuple[bool, List[str]]] = {}
+    try:
+        flake8_command = [*_FLAKE8_COMMAND, f"--format={_FLAKE8_FORMAT}", *to_check]
 
         logger.info(f"Running flake8 command: {' '.join(flake8_command)}")
         process = subprocess.run(
             flake8_command, capture_output=True, text=True, check=False
         )  # check=False to handle non-zero exits ourselves
 
-        if process.returncode == 0 and not process.stdout.strip():
-            # Flake8 found no issues if stdout is empty and return code is 0
-            # Some versions of flake8 might return 0 even with warnings if not configured to error on them.
-            # However, typically, any output to stdout means issues were found.
-            # A stricter check might be just `process.returncode == 0`.
-            # For now, let's consider any stdout as potential issues to report.
-            return True, []
-        else:
-            # If stdout is not empty, or returncode is non-zero, there are issues.
-            # Flake8 outputs errors/warnings to stdout.
-            # Stderr might contain other execution errors of flake8 itself.
-            errors = process.stdout.strip().splitlines()
-            if process.stderr.strip():  # Log flake8's own errors if any
-                logger.warning(f"Flake8 stderr output: {process.stderr.strip()}")
-                # Optionally add stderr to returned errors if it's relevant to code quality
-                # errors.append(f"Flake8 execution error: {process.stderr.strip()}")
-
-            # Ensure we return False if there was any output, even if returncode was 0 (e.g. only warnings)
+        # Flake8 outputs errors/warnings to stdout, one per line.
+        # Stderr might contain other execution errors of flake8 itself.
+        errors_by_path: Dict[Path, List[str]] = {fp: [] for fp in to_check.values()}
+        # Split and drop blank lines in one pass rather than strip() + splitlines().
+        for line in filter(None, process.stdout.splitlines()):
+            fields = line.split("\t", 4)
+            filepath = to_check.get(fields[0]) if len(fields) == 5 else None
+            if filepath is None:
+                # Not attributable to one file: report it against all of them.
+                for errors in errors_by_path.values():
+                    errors.append(line)
+                continue
+            _, row, col, code, text = fields
+            errors_by_path[filepath].append(f"{fields[0]}:{row}:{col}: {code} {text}")
+
+        stderr = process.stderr.strip()
+        if stderr:  # Log flake8's own errors if any
+            logger.warning(f"Flake8 stderr output: {stderr}")
+            # Optionally add stderr to returned errors if it's relevant to code quality
+            # errors.append(f"Flake8 execution error: {stderr}")
+
+        any_errors = any(errors_by_path.values())
+        for filepath, errors in errors_by_path.items():
+            # Any output counts as a failure, even if returncode was 0 (e.g. only warnings)
             if errors:
-                return False, errors
-            elif (
-                process.returncode != 0
-            ):  # No stdout, but non-zero exit (less common for flake8)
-                return False, [
-                    f"flake8 exited with code {process.returncode} but no specific errors on stdout. Stderr: {process.stderr.strip()}"
-                ]
-            else:  # Should ideally not be reached if logic above is sound (returncode 0, no stdout = success)
-                return True, []
+                results[filepath] = (False, errors)
+            elif process.returncode != 0 and not any_errors:
+                # No stdout, but non-zero exit (less common for flake8)
+                results[filepath] = (
+                    False,
+                    [
+                        f"flake8 exited with code {process.returncode} but no specific errors on stdout. Stderr: {stderr}"
+                    ],
+                )
+            else:
+                results[filepath] = (True, [])
+        return results
 
     except FileNotFoundError:  # If `python` or `flake8` (if not using -m) isn't found
         logger.error(
             "flake8 command not found. Ensure flake8 is installed and in PATH or python -m flake8 works.",
             exc_info=True,
         )
-        return False, [
-            "flake8 execution failed: command not found. Is it installed in the environment?"
-        ]
-    except subprocess.CalledProcessError as e:  # Should be caught by check=False now
-        logger.error(
-            f"flake8 execution failed with CalledProcessError: {e}", exc_info=True
+        failure = (
+            False,
+            [
+                "flake8 execution failed: command not found. Is it installed in the environment?"
+            ],
         )
-        errors = e.stdout.strip().splitlines() if e.stdout else []
-        if e.stderr:
-            errors.extend(e.stderr.strip().splitlines())
-        if not errors:
-            errors = [str(e)]
-        return False, errors
     except Exception as e:
         logger.error(
             f"An unexpected error occurred during flake8 validation: {e}", exc_info=True
         )
-        return False, [f"Unexpected error during flake8: {str(e)}"]
+        failure = (False, [f"Unexpected error during flake8: {str(e)}"])
+
+    for filepath in to_check.values():
+        results[filepath] = failure
+    return results
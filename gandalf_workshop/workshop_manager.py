@@ -9,9 +9,35 @@ artisans (AI agents/crews), and ensures quality standards are met throughout
 the creation process.
 """
 
+import asyncio
+import contextlib
+import copy
+import dbm
+import hashlib
 import logging
+import multiprocessing
+import reprlib
+import shelve
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any  # Added Optional, Dict, Any
+from typing import (
+    Callable,
+    Iterator,
+    Optional,
+    Dict,
+    Any,
+    ClassVar,
+    List,
+    Set,
+    Tuple,
+    Union,
+)  # Added Optional, Dict, Any
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows.
+    fcntl = None
 
 # from datetime import datetime, timezone # No longer used in V1
 
@@ -46,6 +72,60 @@ from gandalf_workshop.validators import (
 
 logger = logging.getLogger(__name__)
 
+# Size-bounded repr for logging plans: formatting stops once the budget is
+# spent, so a plan with hundreds of tasks costs no more to log than a short one.
+_log_repr = reprlib.Repr()
+_log_repr.maxlist = 3
+_log_repr.maxstring = 50
+
+# Root under which each commission gets its own output directory.
+DEFAULT_WORKSHOP_ROOT = Path("outputs")
+# Default number of commissions run_batch lets run at the same time.
+DEFAULT_MAX_PARALLEL_COMMISSIONS = 4
+# Most initial plans a manager keeps; the least recently used go first.
+PLAN_CACHE_MAX_ENTRIES = 1024
+# Most syntax audits, and most passing live audits, a manager keeps; the
+# least recently used go first.
+AUDIT_CACHE_MAX_ENTRIES = 1024
+# Without fcntl, commission cache access is only serialised between the
+# threads of this process, not between processes sharing the cache file.
+_COMMISSION_CACHE_THREAD_LOCK = threading.Lock()
+
+
+# Task prefixes of the plans the live planner returns in place of raising
+# when it is not configured or its provider call fails.
+_PLANNER_ERROR_PREFIXES = ("Error:", "Error during planning:")
+
+
+def _is_error_plan(plan_output: PlanOutput) -> bool:
+    """True if plan_output is the live planner's report of a failure."""
+    return bool(plan_output.tasks) and plan_output.tasks[0].startswith(
+        _PLANNER_ERROR_PREFIXES
+    )
+
+
+class AuditFailure(Exception):
+    """
+    Raised when a commission runs out of attempts without passing audit.
+
+    Carries the last failure so callers can inspect it directly instead of
+    parsing the exception message: `last_failure_message` is the feedback
+    that was given to the planner, and `audit_output` is the AuditOutput
+    behind it, or None if the last attempt failed before an audit ran
+    (e.g. the Coder produced no file).
+    """
+
+    def __init__(
+        self,
+        commission_id: str,
+        last_failure_message: str,
+        audit_output: Optional[AuditOutput] = None,
+    ):
+        super().__init__(f"Max total attempts reached for '{commission_id}'.")
+        self.commission_id = commission_id
+        self.last_failure_message = last_failure_message
+        self.audit_output = audit_output
+
 
 class WorkshopManager:
     # --- Parameters for Retry Limits and Strategy Controls ---
@@ -67,8 +147,33 @@ class WorkshopManager:
     ]
     # --- End Parameters ---
 
-    def __init__(self, preferred_llm_provider: Optional[str] = None):
+    # Commission output directories already created by this process, so a
+    # repeated commission ID skips the mkdir. The coders create their own
+    # subdirectories with parents=True, so a directory removed in the
+    # meantime is still recreated before anything is written into it.
+    _ensured_dirs: ClassVar[Set[Path]] = set()
+
+    def __init__(
+        self,
+        preferred_llm_provider: Optional[str] = None,
+        workshop_root: Optional[Path] = None,
+        commission_cache_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            commission_cache_path: If given, a shelve file in which finished
+                commissions are recorded, so re-running the same prompt and
+                commission ID (in this or a later process) returns the
+                earlier code path instead of re-running the agents. Several
+                processes may share one cache; access is file-locked.
+        """
         logger.info("Workshop Manager (V1) initializing...")
+        self.workshop_root = (
+            Path(workshop_root) if workshop_root is not None else DEFAULT_WORKSHOP_ROOT
+        )
+        self.commission_cache_path = (
+            Path(commission_cache_path) if commission_cache_path is not None else None
+        )
         self.llm_provider_manager = LLMProviderManager()
         self.llm_config: Optional[Dict[str, Any]] = (
             self.llm_provider_manager.get_llm_provider(
@@ -82,9 +187,38 @@ class WorkshopManager:
             )
         else:
             logger.info(
-                f"Workshop Manager: Successfully configured LLM provider: {self.llm_config.get('provider_name', 'Unknown')}"
+                "Workshop Manager: Successfully configured LLM provider: %s",
+                self.llm_config.get("provider_name", "Unknown"),
             )
 
+        # Memoized agent outputs, reused when a commission repeats work an
+        # earlier one already did. Shared (not copied) by the per-commission
+        # copies run_v1_commission_async makes.
+        # (16-byte BLAKE2b digest of user_prompt, provider_name) -> initial
+        # plan, in least-to-most recently used order. Keyed on the digest so
+        # the cache doesn't hold on to every (possibly long) prompt.
+        self._plan_cache: Dict[Tuple[bytes, Optional[str]], PlanOutput] = {}
+        self._plan_cache_lock = threading.Lock()
+        # Same keys -> planner call in progress, so commissions running
+        # concurrently with the same prompt share one call (guarded by the
+        # same lock).
+        self._plans_in_flight: Dict[Tuple[bytes, Optional[str]], Future] = {}
+        # (file name, sha256 of contents) -> syntax audit of that code, in
+        # least-to-most recently used order
+        self._syntax_audit_cache: Dict[Tuple[str, str], AuditOutput] = {}
+        # (sha256 of code, plan tasks, provider_name) -> passing live audit,
+        # in least-to-most recently used order
+        self._live_audit_cache: Dict[
+            Tuple[str, Tuple[str, ...], Optional[str]], AuditOutput
+        ] = {}
+        # Guards both audit caches.
+        self._audit_cache_lock = threading.Lock()
+        # Where syntax audits run; None runs them in the calling thread.
+        # run_batch can hand its commissions a process pool instead.
+        self._audit_executor: Optional[Executor] = None
+        # commission_id -> running commission started by launch_commission
+        self._jobs: Dict[str, "asyncio.Task[Path]"] = {}
+
         # Initialize strategy-related state for each WorkshopManager instance
         self.current_strategy_index = 0
         self.attempts_this_strategy = 0
@@ -100,26 +234,259 @@ class WorkshopManager:
             self.current_strategy_index = 0
             self.total_strategy_cycles_completed += 1
             logger.info(
-                f"Completed strategy cycle {self.total_strategy_cycles_completed}. "
-                f"Resetting to first strategy: {self.STRATEGIES[self.current_strategy_index]}"
+                "Completed strategy cycle %s. Resetting to first strategy: %s",
+                self.total_strategy_cycles_completed,
+                self.STRATEGIES[self.current_strategy_index],
             )
         return self.STRATEGIES[self.current_strategy_index]
 
+    def _initial_plan(
+        self, user_prompt: str, commission_id: str, llm_config: Dict[str, Any]
+    ) -> PlanOutput:
+        """
+        Returns the initial plan for user_prompt, calling the live planner only
+        the first time a prompt is seen with this provider. Re-plans after a
+        failed attempt are not cached: they exist to get a different plan.
+        At most PLAN_CACHE_MAX_ENTRIES plans are kept.
+
+        If another commission (e.g. in the same run_batch) is already
+        planning the same prompt, this waits for its plan rather than
+        making a second planner call.
+
+        The live planner reports provider failures as an error plan rather
+        than raising. Such a plan is returned but neither cached nor handed
+        to waiting commissions, which plan again themselves.
+        """
+        key = (
+            hashlib.blake2b(user_prompt.encode("utf-8"), digest_size=16).digest(),
+            llm_config.get("provider_name"),
+        )
+        while True:
+            pending: Optional[Future] = None
+            with self._plan_cache_lock:
+                plan_output = self._plan_cache.pop(key, None)
+                if plan_output is not None:
+                    # Re-inserting marks the entry as the most recently used.
+                    self._plan_cache[key] = plan_output
+                else:
+                    pending = self._plans_in_flight.get(key)
+                    if pending is None:
+                        self._plans_in_flight[key] = Future()
+            if plan_output is not None:
+                logger.info(
+                    "Workshop Manager: Reusing cached plan for this prompt for '%s'.",
+                    commission_id,
+                )
+                return plan_output
+            if pending is None:
+                break
+            logger.info(
+                "Workshop Manager: Waiting on the plan already in progress for this prompt for '%s'.",
+                commission_id,
+            )
+            plan_output = pending.result()
+            if plan_output is not None:
+                return plan_output
+            # That planner call failed; try again rather than reuse its error.
+
+        try:
+            plan_output = initialize_live_planner_agent(
+                user_prompt, commission_id, llm_config=llm_config
+            )
+        except BaseException as e:
+            with self._plan_cache_lock:
+                self._plans_in_flight.pop(key).set_exception(e)
+            raise
+        failed = _is_error_plan(plan_output)
+        if failed:
+            logger.warning(
+                "Workshop Manager: Planner failed for '%s'; not caching its plan.",
+                commission_id,
+            )
+        with self._plan_cache_lock:
+            if not failed:
+                self._plan_cache[key] = plan_output
+                if len(self._plan_cache) > PLAN_CACHE_MAX_ENTRIES:
+                    del self._plan_cache[next(iter(self._plan_cache))]
+            self._plans_in_flight.pop(key).set_result(None if failed else plan_output)
+        return plan_output
+
+    def _syntax_audit(
+        self,
+        code_output: CodeOutput,
+        source: str,
+        source_digest: str,
+        commission_id: str,
+    ) -> AuditOutput:
+        """
+        Runs the syntax auditor on source, the contents of the Coder's file,
+        reusing the result when the same file name and contents were already
+        audited (e.g. a retry that produced identical code). `source_digest`
+        is the SHA-256 hex digest of the file's contents. At most
+        AUDIT_CACHE_MAX_ENTRIES audits are kept.
+        """
+        key = (code_output.code_path.name, source_digest)
+        with self._audit_cache_lock:
+            audit_output = self._syntax_audit_cache.pop(key, None)
+            if audit_output is not None:
+                # Re-inserting marks the entry as the most recently used.
+                self._syntax_audit_cache[key] = audit_output
+        if audit_output is None:
+            if self._audit_executor is not None:
+                audit_output = self._audit_executor.submit(
+                    initialize_auditor_agent_v1,
+                    code_input=code_output,
+                    commission_id=commission_id,
+                    source_code=source,
+                ).result()
+            else:
+                audit_output = initialize_auditor_agent_v1(
+                    code_input=code_output,
+                    commission_id=commission_id,
+                    source_code=source,
+                )
+            with self._audit_cache_lock:
+                self._syntax_audit_cache[key] = audit_output
+                if len(self._syntax_audit_cache) > AUDIT_CACHE_MAX_ENTRIES:
+                    del self._syntax_audit_cache[next(iter(self._syntax_audit_cache))]
+        return audit_output
+
+    def _live_audit(
+        self,
+        source: str,
+        source_digest: str,
+        plan_output: PlanOutput,
+        commission_id: str,
+        llm_config: Dict[str, Any],
+    ) -> AuditOutput:
+        """
+        Runs the live (LLM) auditor on source, skipping the LLM call when the
+        same code was already passed against the same plan by this provider.
+        Only passes are reused: a failure may be a transient provider error,
+        so it is always re-audited. At most AUDIT_CACHE_MAX_ENTRIES passes
+        are kept.
+        """
+        key = (
+            source_digest,
+            tuple(plan_output.tasks),
+            llm_config.get("provider_name"),
+        )
+        with self._audit_cache_lock:
+            audit_output = self._live_audit_cache.pop(key, None)
+            if audit_output is not None:
+                # Re-inserting marks the entry as the most recently used.
+                self._live_audit_cache[key] = audit_output
+        if audit_output is not None:
+            logger.info(
+                "Workshop Manager: Reusing passing live audit of identical code for '%s'.",
+                commission_id,
+            )
+            return audit_output
+        audit_output = initialize_live_auditor_agent(
+            generated_code=source,
+            plan_input=plan_output,
+            commission_id=commission_id,
+            llm_config=llm_config,
+        )
+        if audit_output.status == AuditStatus.SUCCESS:
+            with self._audit_cache_lock:
+                self._live_audit_cache[key] = audit_output
+                if len(self._live_audit_cache) > AUDIT_CACHE_MAX_ENTRIES:
+                    del self._live_audit_cache[next(iter(self._live_audit_cache))]
+        return audit_output
+
+    def _commission_cache_key(self, user_prompt: str, commission_id: str) -> str:
+        key_material = "\0".join([str(self.workshop_root), commission_id, user_prompt])
+        return hashlib.blake2b(key_material.encode("utf-8"), digest_size=16).hexdigest()
+
+    @contextlib.contextmanager
+    def _open_commission_cache(self, writable: bool) -> Iterator[shelve.Shelf]:
+        """
+        Opens the commission cache under a lock on a "<path>.lock" file next
+        to it: shared for lookups, exclusive for writes. shelve files don't
+        support a writer alongside other readers or writers, and the lock
+        covers every thread and process using the file (e.g. run_batch
+        threads, or several processes sharing one cache). Where fcntl is
+        unavailable, a lock shared by this process's threads is used instead.
+
+        A lookup opens the shelf read-only, and raises dbm.error if it has
+        not been created yet.
+        """
+        assert self.commission_cache_path is not None
+        lock_path = self.commission_cache_path.with_name(
+            self.commission_cache_path.name + ".lock"
+        )
+        with contextlib.ExitStack() as stack:
+            if fcntl is None:
+                stack.enter_context(_COMMISSION_CACHE_THREAD_LOCK)
+            else:
+                lock_file = stack.enter_context(open(lock_path, "a"))
+                # Released when lock_file is closed.
+                fcntl.flock(lock_file, fcntl.LOCK_EX if writable else fcntl.LOCK_SH)
+            with shelve.open(
+                str(self.commission_cache_path), flag="c" if writable else "r"
+            ) as cache:
+                yield cache
+
+    def _load_cached_commission(
+        self, user_prompt: str, commission_id: str
+    ) -> Optional[Path]:
+        """
+        Returns the code path recorded for this prompt and commission ID, if
+        the commission cache has one and the file still exists.
+        """
+        if self.commission_cache_path is None:
+            return None
+        key = self._commission_cache_key(user_prompt, commission_id)
+        try:
+            with self._open_commission_cache(writable=False) as cache:
+                cached = cache.get(key)
+        except dbm.error:
+            # Nothing has been stored yet.
+            return None
+        if cached is None or not Path(cached).is_file():
+            return None
+        return Path(cached)
+
+    def _store_cached_commission(
+        self, user_prompt: str, commission_id: str, code_path: Path
+    ) -> None:
+        if self.commission_cache_path is None:
+            return
+        key = self._commission_cache_key(user_prompt, commission_id)
+        with self._open_commission_cache(writable=True) as cache:
+            cache[key] = str(code_path)
+
     def run_v1_commission(
         self, user_prompt: str, commission_id: str = "v1_commission"
     ) -> Path:
-        logger.info(f"===== Starting V1 Workflow for Commission: {commission_id} =====")
-        logger.info(f"User Prompt: {user_prompt}")
+        logger.info(
+            "===== Starting V1 Workflow for Commission: %s =====", commission_id
+        )
+        logger.info("User Prompt: %s", user_prompt)
+
+        cached_code_path = self._load_cached_commission(user_prompt, commission_id)
+        if cached_code_path is not None:
+            logger.info(
+                "Workshop Manager: Commission '%s' already completed; reusing %s.",
+                commission_id,
+                cached_code_path,
+            )
+            return cached_code_path
 
-        commission_base_output_dir = Path("outputs") / commission_id
-        commission_base_output_dir.mkdir(parents=True, exist_ok=True)
+        commission_base_output_dir = self.workshop_root / commission_id
+        if commission_base_output_dir not in self._ensured_dirs:
+            commission_base_output_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(commission_base_output_dir)
         logger.info(
-            f"Workshop Manager: Ensured base output directory exists: {commission_base_output_dir}"
+            "Workshop Manager: Ensured base output directory exists: %s",
+            commission_base_output_dir,
         )
 
         if not self.llm_config:
             logger.error(
-                f"Workshop Manager: Cannot run commission '{commission_id}'. No LLM provider configured."
+                "Workshop Manager: Cannot run commission '%s'. No LLM provider configured.",
+                commission_id,
             )
             raise ConnectionError(
                 "LLM provider not available. Commission cannot be processed."
@@ -134,19 +501,21 @@ class WorkshopManager:
         active_strategy = self.STRATEGIES[self.current_strategy_index]
 
         logger.info(
-            f"Workshop Manager: Invoking Initial Live Planner Agent for '{commission_id}'."
+            "Workshop Manager: Invoking Initial Live Planner Agent for '%s'.",
+            commission_id,
         )
-        plan_output = initialize_live_planner_agent(
+        plan_output = self._initial_plan(
             user_prompt, commission_id, llm_config=self.llm_config.copy()  # Pass a copy
         )
-        plan_tasks_str = str(plan_output.tasks)
-        if len(plan_tasks_str) > 50:
-            plan_tasks_str = plan_tasks_str[:47] + "..."
-        logger.info(
-            f"Workshop Manager: Initial Planner Agent returned plan: {plan_tasks_str}"
-        )
+        # The plan repr is only built when INFO records will actually be emitted.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Workshop Manager: Initial Planner Agent returned plan: %s",
+                _log_repr.repr(plan_output.tasks),
+            )
 
         last_audit_failure_message = "No audit failures yet."
+        last_failed_audit: Optional[AuditOutput] = None
         code_output: Optional[CodeOutput] = (
             None  # Ensure code_output is defined for the final return
         )
@@ -157,14 +526,24 @@ class WorkshopManager:
 
             if self.overall_attempt_count > self.MAX_TOTAL_ATTEMPTS:
                 logger.error(
-                    f"Commission '{commission_id}' exceeded MAX_TOTAL_ATTEMPTS ({self.MAX_TOTAL_ATTEMPTS}). Aborting."
+                    "Commission '%s' exceeded MAX_TOTAL_ATTEMPTS (%s). Aborting.",
+                    commission_id,
+                    self.MAX_TOTAL_ATTEMPTS,
+                )
+                raise AuditFailure(
+                    commission_id, last_audit_failure_message, last_failed_audit
                 )
-                raise Exception(f"Max total attempts reached for '{commission_id}'.")
 
             logger.info(
-                f"Workshop Manager: Overall Attempt {self.overall_attempt_count}/{self.MAX_TOTAL_ATTEMPTS}, "
-                f"Strategy: {active_strategy} (Attempt {self.attempts_this_strategy}/{self.MAX_ATTEMPTS_PER_STRATEGY}, "
-                f"Cycle {self.total_strategy_cycles_completed + 1}/{self.MAX_STRATEGY_CYCLES}) for '{commission_id}'."
+                "Workshop Manager: Overall Attempt %s/%s, Strategy: %s (Attempt %s/%s, Cycle %s/%s) for '%s'.",
+                self.overall_attempt_count,
+                self.MAX_TOTAL_ATTEMPTS,
+                active_strategy,
+                self.attempts_this_strategy,
+                self.MAX_ATTEMPTS_PER_STRATEGY,
+                self.total_strategy_cycles_completed + 1,
+                self.MAX_STRATEGY_CYCLES,
+                commission_id,
             )
 
             current_llm_config_for_attempt = self.llm_config.copy()
@@ -173,7 +552,9 @@ class WorkshopManager:
             if active_strategy == "INCREASE_TEMPERATURE":
                 new_temp = 0.8  # Fixed higher temperature for this strategy
                 logger.info(
-                    f"Strategy '{active_strategy}': Setting LLM temperature to {new_temp} for Coder and relevant Auditors/Planners."
+                    "Strategy '%s': Setting LLM temperature to %s for Coder and relevant Auditors/Planners.",
+                    active_strategy,
+                    new_temp,
                 )
                 current_llm_config_for_attempt["temperature"] = new_temp
             else:
@@ -186,11 +567,15 @@ class WorkshopManager:
                     # Avoid re-planning if this strategy is chosen first and it's the very first attempt overall.
                     # Or if it's the first attempt *for this strategy* in its current cycle.
                     logger.info(
-                        f"Strategy '{active_strategy}': First attempt with this strategy, using existing plan for '{commission_id}'."
+                        "Strategy '%s': First attempt with this strategy, using existing plan for '%s'.",
+                        active_strategy,
+                        commission_id,
                     )
                 else:
                     logger.info(
-                        f"Strategy '{active_strategy}': Re-invoking planner for '{commission_id}'."
+                        "Strategy '%s': Re-invoking planner for '%s'.",
+                        active_strategy,
+                        commission_id,
                     )
                     replan_prompt = f"Original request: {user_prompt}\nPrevious attempt failed. Last audit feedback: {last_audit_failure_message}\nPlease generate a revised plan."
                     # The planner will use current_llm_config_for_attempt (which might have its own temp setting for this strategy)
@@ -199,14 +584,18 @@ class WorkshopManager:
                         commission_id,
                         llm_config=current_llm_config_for_attempt,
                     )
-                    logger.info(f"Re-planner returned new plan: {plan_output.tasks}")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Re-planner returned new plan: %s",
+                            _log_repr.repr(plan_output.tasks),
+                        )
             # --- End strategy-specific modifications ---
 
             # Determine coder prompt charter based on strategy
             coder_prompt_charter_to_use: Optional[str] = None
             if active_strategy == "ALTERNATIVE_PROMPT_1":
                 logger.info(
-                    f"Strategy '{active_strategy}': Using CODER_CHARTER_PROMPT_ALT_1."
+                    "Strategy '%s': Using CODER_CHARTER_PROMPT_ALT_1.", active_strategy
                 )
                 coder_prompt_charter_to_use = CODER_CHARTER_PROMPT_ALT_1
 
@@ -218,72 +607,95 @@ class WorkshopManager:
                 prompt_charter_override=coder_prompt_charter_to_use,
             )
             logger.info(
-                f"Workshop Manager: Coder Agent completed. Path: {code_output.code_path}, Msg: {code_output.message}"
+                "Workshop Manager: Coder Agent completed. Path: %s, Msg: %s",
+                code_output.code_path,
+                code_output.message,
             )
 
             attempt_successful = False
+            last_failed_audit = None
             if (
                 not code_output.code_path.is_file()
                 or not code_output.code_path.exists()
             ):
                 logger.error(
-                    f"Coder Agent failed to create file at {code_output.code_path}. Msg: {code_output.message}."
+                    "Coder Agent failed to create file at %s. Msg: %s.",
+                    code_output.code_path,
+                    code_output.message,
                 )
                 last_audit_failure_message = (
                     f"Coder failed to produce a file. Message: {code_output.message}"
                 )
             else:
-                syntax_audit_output = initialize_auditor_agent_v1(
-                    code_input=code_output, commission_id=commission_id
-                )
-                logger.info(
-                    f"Syntax Auditor: Status: {syntax_audit_output.status}, Msg: {syntax_audit_output.message}"
-                )
-                if syntax_audit_output.status == AuditStatus.SUCCESS:
-                    try:
-                        with open(code_output.code_path, "r", encoding="utf-8") as f:
-                            generated_code_str = f.read()
-
-                        live_audit_output = initialize_live_auditor_agent(
-                            generated_code=generated_code_str,
-                            plan_input=plan_output,
-                            commission_id=commission_id,
-                            llm_config=current_llm_config_for_attempt,
+                try:
+                    # Read the Coder's file once: both auditors audit this
+                    # text, and both audit caches are keyed on its digest.
+                    source = code_output.code_path.read_bytes()
+                    source_digest = hashlib.sha256(source).hexdigest()
+                    source_text = source.decode("utf-8")
+                    syntax_audit_output = self._syntax_audit(
+                        code_output, source_text, source_digest, commission_id
+                    )
+                    logger.info(
+                        "Syntax Auditor: Status: %s, Msg: %s",
+                        syntax_audit_output.status,
+                        syntax_audit_output.message,
+                    )
+                    if syntax_audit_output.status == AuditStatus.SUCCESS:
+                        live_audit_output = self._live_audit(
+                            source_text,
+                            source_digest,
+                            plan_output,
+                            commission_id,
+                            current_llm_config_for_attempt,
                         )
                         logger.info(
-                            f"Live Auditor: Status: {live_audit_output.status}, Msg: {live_audit_output.message}"
+                            "Live Auditor: Status: %s, Msg: %s",
+                            live_audit_output.status,
+                            live_audit_output.message,
                         )
                         if live_audit_output.status == AuditStatus.SUCCESS:
                             attempt_successful = True
                         else:
+                            last_failed_audit = live_audit_output
                             last_audit_failure_message = (
                                 live_audit_output.message
                                 if live_audit_output.message
                                 else "Live audit failed without specific message."
                             )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to read/audit code file {code_output.code_path}: {e}",
-                            exc_info=True,
-                        )
+                    else:
+                        last_failed_audit = syntax_audit_output
                         last_audit_failure_message = (
-                            f"Error during live audit file read: {str(e)}"
+                            syntax_audit_output.message
+                            if syntax_audit_output.message
+                            else "Syntax audit failed without specific message."
                         )
-                else:
+                except Exception as e:
+                    logger.error(
+                        "Failed to read/audit code file %s: %s",
+                        code_output.code_path,
+                        e,
+                        exc_info=True,
+                    )
                     last_audit_failure_message = (
-                        syntax_audit_output.message
-                        if syntax_audit_output.message
-                        else "Syntax audit failed without specific message."
+                        f"Error during audit file read: {str(e)}"
                     )
 
             if attempt_successful:
                 logger.info(
-                    f"Commission '{commission_id}' PASSED with strategy '{active_strategy}' on overall attempt {self.overall_attempt_count}."
+                    "Commission '%s' PASSED with strategy '%s' on overall attempt %s.",
+                    commission_id,
+                    active_strategy,
+                    self.overall_attempt_count,
                 )
                 break
 
             logger.warning(
-                f"Attempt {self.attempts_this_strategy} for strategy '{active_strategy}' FAILED for '{commission_id}'. Last error: {last_audit_failure_message}"
+                "Attempt %s for strategy '%s' FAILED for '%s'. Last error: %s",
+                self.attempts_this_strategy,
+                active_strategy,
+                commission_id,
+                last_audit_failure_message,
             )
 
             if self.attempts_this_strategy >= self.MAX_ATTEMPTS_PER_STRATEGY:
@@ -292,10 +704,14 @@ class WorkshopManager:
                     and self.current_strategy_index == len(self.STRATEGIES) - 1
                 ):
                     logger.warning(
-                        f"Commission '{commission_id}' has completed {self.total_strategy_cycles_completed + 1} full strategy cycles "
-                        f"and exhausted attempts for all strategies in the current cycle. "
-                        f"The MAX_STRATEGY_CYCLES ({self.MAX_STRATEGY_CYCLES}) limit has been effectively reached or exceeded. "
-                        f"Loop will continue (up to MAX_TOTAL_ATTEMPTS), cycling strategies again."
+                        "Commission '%s' has completed %s full strategy cycles and "
+                        "exhausted attempts for all strategies in the current cycle. "
+                        "The MAX_STRATEGY_CYCLES (%s) limit has been effectively "
+                        "reached or exceeded. Loop will continue (up to "
+                        "MAX_TOTAL_ATTEMPTS), cycling strategies again.",
+                        commission_id,
+                        self.total_strategy_cycles_completed + 1,
+                        self.MAX_STRATEGY_CYCLES,
                     )
 
                 previous_strategy = active_strategy
@@ -303,27 +719,148 @@ class WorkshopManager:
                     self._get_next_strategy()
                 )  # This also resets self.attempts_this_strategy
                 logger.info(
-                    f"Switching strategy for '{commission_id}' from '{previous_strategy}' to '{active_strategy}'."
+                    "Switching strategy for '%s' from '%s' to '%s'.",
+                    commission_id,
+                    previous_strategy,
+                    active_strategy,
                 )
 
             logger.info(
-                f"Retrying commission '{commission_id}' (next attempt with strategy '{active_strategy}')..."
+                "Retrying commission '%s' (next attempt with strategy '%s')...",
+                commission_id,
+                active_strategy,
             )
 
         if (
             not code_output
         ):  # Should not happen if loop runs at least once and coder produces output
             logger.error(
-                f"Commission '{commission_id}' ended without valid code_output."
+                "Commission '%s' ended without valid code_output.", commission_id
             )
             raise Exception(
                 f"Workflow ended unexpectedly without code output for '{commission_id}'."
             )
 
         logger.info(
-            f"===== V1 Workflow for Commission: {commission_id} Completed Successfully after {self.overall_attempt_count} attempt(s) ====="
+            "===== V1 Workflow for Commission: %s Completed Successfully after %s attempt(s) =====",
+            commission_id,
+            self.overall_attempt_count,
         )
+        self._store_cached_commission(user_prompt, commission_id, code_output.code_path)
         return code_output.code_path
 
+    async def run_v1_commission_async(
+        self,
+        user_prompt: str,
+        commission_id: str = "v1_commission",
+        audit_executor: Optional[Executor] = None,
+    ) -> Path:
+        """
+        Runs run_v1_commission in a worker thread so the event loop stays free
+        while the agents wait on the LLM. The agent calls within a commission
+        depend on each other and still run in order.
+
+        The commission runs on a shallow copy of this manager: the strategy
+        counters are per-commission state, so concurrent commissions must not
+        share them. The LLM config and provider manager are shared read-only.
+
+        If audit_executor is given, the commission's syntax audits are
+        submitted to it instead of running in the worker thread.
+        """
+        commission_manager = copy.copy(self)
+        if audit_executor is not None:
+            commission_manager._audit_executor = audit_executor
+        return await asyncio.to_thread(
+            commission_manager.run_v1_commission, user_prompt, commission_id
+        )
+
+    def launch_commission(
+        self,
+        user_prompt: str,
+        commission_id: str = "v1_commission",
+        on_complete: Optional[Callable[["asyncio.Task[Path]"], None]] = None,
+    ) -> str:
+        """
+        Starts a commission on the running event loop and returns its ID
+        straight away, so a caller (e.g. a server handler) can launch many
+        commissions without waiting on each. Must be called from within a
+        running event loop.
+
+        Args:
+            on_complete: Called with the finished asyncio.Task when the
+                commission completes, whether it succeeded or failed.
+
+        Returns:
+            str: The commission ID, to pass to collect() for the result.
+        """
+        if commission_id in self._jobs:
+            raise ValueError(f"Commission '{commission_id}' is already running.")
+        task = asyncio.create_task(
+            self.run_v1_commission_async(user_prompt, commission_id)
+        )
+        if on_complete is not None:
+            task.add_done_callback(on_complete)
+        self._jobs[commission_id] = task
+        return commission_id
+
+    async def collect(self, commission_id: str) -> Path:
+        """
+        Waits for a commission started by launch_commission and returns its
+        code path, re-raising the exception it failed with, if any.
+        """
+        return await self._jobs.pop(commission_id)
+
+    async def run_batch(
+        self,
+        commissions: List[Tuple[str, str]],
+        max_parallel: int = DEFAULT_MAX_PARALLEL_COMMISSIONS,
+        audit_in_processes: bool = False,
+    ) -> List[Union[Path, BaseException]]:
+        """
+        Runs several (user_prompt, commission_id) commissions concurrently,
+        at most max_parallel at a time, so a batch takes roughly as long as
+        its slowest commissions rather than the sum of all of them.
+
+        The commissions share one worker thread pool, which suits the
+        I/O-bound LLM calls but serializes CPU-bound work on the GIL. With
+        audit_in_processes=True the syntax audits are instead sent to a
+        process pool (one worker per CPU) created for the batch. Each audit
+        then pays for a round trip to a worker process, so this only pays
+        off for auditors that do far more work than a compile() check.
+
+        Returns:
+            List[Union[Path, BaseException]]: For each commission, in input
+            order, the generated code path, or the exception it failed with.
+            One failed commission does not cancel the others.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        # Workers are started from the commissions' threads while other
+        # threads may hold locks, so they are spawned rather than forked.
+        audit_executor = (
+            ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            if audit_in_processes
+            else None
+        )
+
+        async def run_one(user_prompt: str, commission_id: str) -> Path:
+            async with semaphore:
+                return await self.run_v1_commission_async(
+                    user_prompt, commission_id, audit_executor=audit_executor
+                )
+
+        logger.info(
+            "Workshop Manager: Running batch of %s commission(s), up to %s at a time.",
+            len(commissions),
+            max_parallel,
+        )
+        try:
+            return await asyncio.gather(
+                *(run_one(prompt, cid) for prompt, cid in commissions),
+                return_exceptions=True,
+            )
+        finally:
+            if audit_executor is not None:
+                audit_executor.shutdown()
+
     # --- Methods from older, more complex workflow (commented out for V1 focus) ---
     # All legacy methods previously here have been removed.